@@ -518,6 +518,25 @@ class MTXPRBalance:
         """Checks if the specified door is open (position > 0)."""
         return self.get_door_position(door) > 0
 
+    def wait_for_door(self, door: MTXPRBalanceDoors, position: int, timeout: float = 5.0, interval: float = 0.1) -> bool:
+        """
+        Polls the door until it reaches the given opening width instead of sleeping a fixed time.
+        :param door: The door to query.
+        :param position: Target opening width (0-100); 0 waits for fully closed, otherwise at least this wide.
+        :param timeout: Maximum time to wait in seconds.
+        :param interval: Delay between polls in seconds.
+        :return: True once the door is in position, False on timeout.
+        """
+        deadline = time.monotonic() + timeout
+        while True:
+            current = self.get_door_position(door)
+            if (current >= position) if position > 0 else (current == 0):
+                return True
+            if time.monotonic() >= deadline:
+                self.logger.warning(f"Door {door.value} did not reach position {position} within {timeout}s (at {current}).")
+                return False
+            time.sleep(interval)
+
     # --- Dosing Head Functions ---
     def read_dosing_head(self) -> Dict[str, Any]:
         """
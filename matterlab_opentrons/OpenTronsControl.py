@@ -1,18 +1,35 @@
 from prefect import flow,task,serve
-from .sshclient import SSHClient
+from .sshclient import SSHClient, get_shared_client
 # from dotenv import load_dotenv
 import os
 import time 
 # from sensor_util import color_sensor
 from pathlib import Path
 from typing import Dict, Union
+from contextlib import contextmanager
+from collections import deque
 import json
+import logging
 
 # load_dotenv(".env")
 
+logger = logging.getLogger(__name__)
+
+PLAN_PATH = "/var/lib/jupyter/notebooks/plan.py"  # where plan() uploads its script on the robot
+
+def _join_statements(code):
+    """Join a list of statements into one REPL line so they cost a single round-trip"""
+    return code if isinstance(code, str) else "; ".join(code)
+
+
 class OpenTrons:
-    def __init__(self, host_alias:str = None, password="", simulation=False):
-        self._connect(host_alias, password)
+    def __init__(self, host_alias:str = None, password="", simulation=False, client: SSHClient = None):
+        """Pass an already-connected client (e.g. from get_shared_client) to skip the SSH handshake"""
+        self._output_log = deque(maxlen=1000)  # remote REPL output, emitted in one record by flush_log()
+        if client is not None:
+            self.client = client
+        else:
+            self._connect(host_alias, password)
         self._get_protocol(simulation)
         self.tip_index_file = str(Path(__file__).parent / "tip_index.json")
         self._load_tip_index()
@@ -43,21 +60,122 @@ class OpenTrons:
         self.client.connect()
 
     def invoke(self, code):
-        return self.client.invoke(code)
+        """Run code in the remote Python session; a list of statements goes out as one line"""
+        output = self.client.invoke(_join_statements(code))
+        self._output_log.append(output)
+        return output
+
+    def flush_log(self, log: logging.Logger = None):
+        """Emit the buffered remote output as a single log record (e.g. pass prefect's get_run_logger())"""
+        if self._output_log:
+            (log or logger).info("\n".join(self._output_log))
+            self._output_log.clear()
+
+    @contextmanager
+    def batch(self):
+        """
+        Buffer every command issued inside the block and send them as a single invoke on exit.
+        Calls that parse the invoke output (well_diameter, well_depth, tip_length) can't be batched.
+        Example:
+            with ot.batch():
+                ot.pick_up_tip(pip_name="p1000")
+                ot.drop_tip(pip_name="p1000")
+        """
+        if "invoke" in self.__dict__:  # already batching or planning; join the outer block
+            yield self
+            return
+        with self._deferred_tip_state() as mark_sent:
+            with self._recording() as commands:
+                yield self
+            if commands:
+                mark_sent()
+                self.invoke("; ".join(commands))
+
+    @contextmanager
+    def plan(self, remote_path: str = PLAN_PATH):
+        """
+        Record every command issued inside the block as a protocol script, upload it once and run it
+        in the remote session on exit, so the whole block costs one upload and one round-trip.
+        Unlike batch() there is no limit on the size of the block; the same restriction on calls
+        that parse the invoke output applies.
+        Example:
+            with ot.plan():
+                ot.load_labware(labware)
+                ot.pick_up_tip(pip_name="p1000")
+                ot.drop_tip(pip_name="p1000")
+        """
+        if "invoke" in self.__dict__:
+            raise RuntimeError("plan() can't be opened inside batch() or another plan()")
+        with self._deferred_tip_state() as mark_sent:
+            with self._recording() as commands:
+                yield self
+            if commands:
+                # A failed upload leaves the robot untouched; once the script starts, tips may be used
+                self._upload_plan(commands, remote_path)
+                mark_sent()
+                self._exec_plan(remote_path)
+
+    def run_plan(self, commands, remote_path: str = PLAN_PATH):
+        """
+        Upload the statements as a script and exec it in the remote session, which already holds
+        protocol, labware and pipettes (a separate opentrons_execute process would not)
+        """
+        self._upload_plan(commands, remote_path)
+        return self._exec_plan(remote_path)
+
+    def _upload_plan(self, commands, remote_path: str):
+        self.client.upload("\n".join(commands) + "\n", remote_path)
+
+    def _exec_plan(self, remote_path: str):
+        return self.invoke(f"exec(compile(open({remote_path!r}).read(), {remote_path!r}, 'exec'))")
+
+    @contextmanager
+    def _deferred_tip_state(self):
+        """
+        Hold tip bookkeeping back until the recorded commands go to the robot. The tip index is not
+        saved inside the block; yields mark_sent, to be called just before the commands are sent.
+        An exception before that restores tip index and racks, since nothing reached the robot.
+        From then on the advanced index is kept and saved even if the send raises: a remote error
+        may come after tips were already used, and skipping a tip is safe where reusing one is not.
+        """
+        tip_index, tip_racks = dict(self.tip_index), dict(self.tip_racks)
+        sent = False
+
+        def mark_sent():
+            nonlocal sent
+            sent = True
+
+        self._save_tip_index = lambda: None  # instance attribute shadows the method
+        try:
+            yield mark_sent
+        except BaseException:
+            if not sent:
+                self.tip_index, self.tip_racks = tip_index, tip_racks
+            raise
+        finally:
+            del self._save_tip_index
+            if self.tip_index != tip_index:
+                self._save_tip_index()
+
+    @contextmanager
+    def _recording(self):
+        """Shadow invoke with a recorder for the block; yields the list of recorded statements"""
+        commands = []
+        self.invoke = lambda code: commands.append(_join_statements(code))  # instance attribute shadows the method
+        try:
+            yield commands
+        finally:
+            del self.invoke
 
     def _disconnect(self):
         self.client.close()
 
     def _get_protocol(self,simulation):
-        self.invoke("from opentrons.types import Point, Location")
-        self.invoke("from opentrons import protocol_api")
-        self.invoke("import json")
         if simulation:
-            self.invoke("from opentrons import simulate")
-            self.invoke("protocol = simulate.get_protocol_api('2.21')")
+            api = ["from opentrons import simulate", "protocol = simulate.get_protocol_api('2.21')"]
         else:
-            self.invoke("from opentrons import execute")
-            self.invoke("protocol = execute.get_protocol_api('2.21')")
+            api = ["from opentrons import execute", "protocol = execute.get_protocol_api('2.21')"]
+        self.invoke(["from opentrons.types import Point, Location", "from opentrons import protocol_api", "import json", *api])
 
     @flow
     def _load_custom_labware(self, nickname: str, labware_config:Dict, location: str):
@@ -74,7 +192,7 @@ class OpenTrons:
         
         # Load the labware and assign to the nickname
         load_cmd = f"{nickname} = protocol.load_labware_from_definition(labware_def=labware_def, location='{location}')"
-        print(f"Executing: {load_cmd}")  # Debug output
+        self._output_log.append(f"Executing: {load_cmd}")
         self.invoke(load_cmd)
         
         # Verify the labware exists in the protocol
@@ -1,5 +1,5 @@
 from .OpenTronsControl import OpenTrons
-from .sshclient import SSHClient
+from .sshclient import SSHClient, get_shared_client
 from .well_plate import WellPlateGenerator
 
-__all__ = ["OpenTrons", "SSHClient", "WellPlateGenerator"]
\ No newline at end of file
+__all__ = ["OpenTrons", "SSHClient", "get_shared_client", "WellPlateGenerator"]
\ No newline at end of file
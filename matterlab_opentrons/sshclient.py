@@ -1,6 +1,9 @@
 import paramiko
 import time
 import os
+import atexit
+import selectors
+import threading
 from pathlib import Path
 import paramiko.config
 
@@ -14,6 +17,8 @@ class SSHClient:
         self.password = password
         self.ssh_client = None
         self.python_session = None
+        # One REPL channel per client; concurrent callers (e.g. flows sharing a pooled client) queue here
+        self._session_lock = threading.Lock()
         self._config_host()
 
     def _config_host(self):
@@ -48,6 +53,13 @@ class SSHClient:
         time.sleep(1)  # Wait for the Python terminal to initialize
         self.clear_buffer()  # Clear initial prompt output
 
+    def is_connected(self):
+        """True while the SSH transport and the Python session channel are both open"""
+        if self.ssh_client is None or self.python_session is None:
+            return False
+        transport = self.ssh_client.get_transport()
+        return transport is not None and transport.is_active() and not self.python_session.closed
+
     def clear_buffer(self):
         """Clear any pending output from the buffer"""
         if self.python_session.recv_ready():
@@ -58,18 +70,8 @@ class SSHClient:
         if self.python_session is None:
             raise Exception("SSH connection is not open. Call connect() first.")
 
-        # Send code to Python terminal and execute
-        self.python_session.send(code + "\n")
-        
-        # Wait for output to finish
-        output = ""
-        while True:
-            time.sleep(0.1)  # Delay for processing
-            if self.python_session.recv_ready():
-                output += self.python_session.recv(1024).decode('utf-8')
-                # Check if Python prompt (">>> ") reappears indicating execution is complete
-                if output.strip().endswith(">>>"):
-                    break
+        with self._session_lock:
+            output = self._send_and_wait(code)
 
         # Check for errors in the output
         if "Traceback (most recent call last):" in output or "Exception" in output:
@@ -78,6 +80,38 @@ class SSHClient:
 
         return output
 
+    def _send_and_wait(self, code):
+        """Send one line to the Python terminal and collect output up to the next prompt"""
+        # Send code to Python terminal and execute
+        self.python_session.send(code + "\n")
+        
+        # Wait for output to finish; the channel's fileno() turns readable when data arrives,
+        # so the selector wakes on output instead of polling on a fixed delay
+        chunks = []
+        tail = b""
+        with selectors.DefaultSelector() as selector:
+            selector.register(self.python_session, selectors.EVENT_READ)
+            while True:
+                selector.select()
+                if not self.python_session.recv_ready():
+                    if self.python_session.closed or self.python_session.eof_received:
+                        raise Exception("SSH session closed while waiting for output.")
+                    continue
+                while self.python_session.recv_ready():
+                    chunks.append(self.python_session.recv(65536))
+                    tail = (tail + chunks[-1])[-16:]
+                # Check if Python prompt (">>> ") reappears indicating execution is complete
+                if tail.rstrip().endswith(b">>>"):
+                    break
+        return b"".join(chunks).decode('utf-8')
+
+    def upload(self, text, remote_path):
+        """Write text to a file on the remote host over SFTP (a separate channel; the Python session is untouched)"""
+        if self.ssh_client is None:
+            raise Exception("SSH connection is not open. Call connect() first.")
+        with self.ssh_client.open_sftp() as sftp, sftp.open(remote_path, "w") as f:
+            f.write(text)
+
     def close(self):
         """Close SSH connection"""
         if self.python_session is not None:
@@ -87,6 +121,39 @@ class SSHClient:
         if self.ssh_client is not None:
             self.ssh_client.close()
 
+
+# Connected clients shared across OpenTrons instances, keyed by (hostname, username)
+_shared_clients = {}
+_shared_lock = threading.Lock()
+
+
+def get_shared_client(hostname=None, username=None, key_file_path=None, host_alias=None, password=None):
+    """Return a connected SSHClient for the host, reusing the pooled session when it is still alive"""
+    client = SSHClient(hostname=hostname, username=username, key_file_path=key_file_path,
+                       host_alias=host_alias, password=password)
+    key = (client.hostname, client.username)
+    with _shared_lock:
+        shared = _shared_clients.get(key)
+        if shared is not None and shared.is_connected():
+            return shared
+        client.connect()
+        _shared_clients[key] = client
+        return client
+
+
+@atexit.register
+def close_shared_clients():
+    """Close every pooled SSH session"""
+    with _shared_lock:
+        clients = list(_shared_clients.values())
+        _shared_clients.clear()
+    for client in clients:
+        try:
+            client.close()
+        except Exception:
+            pass
+
+
 if __name__ == "__main__":
     # Instantiate and connect with the private key
     ssh_client = SSHClient(
@@ -1,15 +1,71 @@
 from robot.ur5_rtde_gripper import Location
 from typing import Union, List
 
+import atexit
+import functools
 import inspect
+import logging
+import os
 import pprint
 import json
+import threading
 import uuid
+import weakref
+from contextlib import contextmanager
 from datetime import datetime
-from collections import OrderedDict
+from types import MappingProxyType
+
+try:
+    import orjson
+except ImportError:  # fall back to the stdlib encoder
+    orjson = None
+
+logger = logging.getLogger(__name__)
+
+# Trays with writes still pending are flushed when the interpreter exits
+_open_trays = weakref.WeakSet()
+
+
+@atexit.register
+def _flush_open_trays():
+    for tray in list(_open_trays):
+        try:
+            tray.flush()
+        except Exception:
+            logger.exception("Failed to write %s at exit", tray.json_file)
+
+
+def _encode_json(obj) -> bytes:
+    """Encode tray data with the same 2-space layout whether or not orjson is installed."""
+    if orjson is not None:
+        return orjson.dumps(obj, option=orjson.OPT_INDENT_2 | orjson.OPT_SERIALIZE_NUMPY)
+    return json.dumps(obj, indent=2).encode()
+
+
+@functools.lru_cache(maxsize=8)
+def _load_solvents(path: str) -> dict:
+    """Parse a solvent library file once per path."""
+    with open(path, "r") as f:
+        return json.load(f)['solvents']
+
+
+@functools.lru_cache(maxsize=None)
+def _init_param_names(cls: type) -> frozenset:
+    """Names of the parameters accepted by cls.__init__, resolved once per class."""
+    return frozenset(inspect.signature(cls.__init__).parameters)
 
 
 class BaseContainer:
+    __slots__ = ('_unique_id', '_user_defined_id', 'well_name', 'tray_name', 'tray', '_used',
+                 'location', 'needle', 'empty_weight_mg', 'weight_history', 'measured_weight',
+                 'summary', '_summary_dirty', '_process_parameters', '_last_weight_mg')
+
+    # Shared, read-only defaults; no need to allocate them per container
+    units = MappingProxyType({'liquid': 'ml', 'solid': 'mg'})
+    DEFAULT_PROCESS_PARAMETERS = MappingProxyType({'temperature': None,
+                                                   'time': None,
+                                                   'stirring': None})
+
     def __init__(self,
                  well_name: str,
                  tray_name: str,
@@ -17,7 +73,7 @@ class BaseContainer:
                  location: Location):
         # IDs
         self._unique_id = None
-        self.user_defined_id = None
+        self._user_defined_id = None
         self.well_name = well_name
         self.tray_name = tray_name
         self.tray = None
@@ -27,23 +83,49 @@ class BaseContainer:
          # Container properties
         self.needle = needle_depth
         self.empty_weight_mg = None
-        self.weight_history = OrderedDict()
-        self.measured_weight = OrderedDict()
-        self.units = {'liquid': 'ml', 'solid': 'mg'}
+        self.weight_history = {}
+        self.measured_weight = {}
         self.summary = None
-        self.process_parameters = {'temperature': None,
-                                   'time': None,
-                                   'stirring': None}
+        self._summary_dirty = True  # get_info() rebuilds summary only when set
+        self._process_parameters = None  # allocated on first access
 
     @property
     def unique_id(self):
         return self._unique_id
 
+    @property
+    def process_parameters(self) -> dict:
+        if self._process_parameters is None:
+            self._process_parameters = dict(self.DEFAULT_PROCESS_PARAMETERS)
+        return self._process_parameters
+
+    @process_parameters.setter
+    def process_parameters(self, value: dict):
+        self._process_parameters = value
+
     def _assign_uuid(self):
         if self._unique_id is not None:
             print(f'Unique ID already set as {self.unique_id}')
         else:
             self._unique_id = str(uuid.uuid4())
+            self._invalidate_summary()
+            if self.tray:
+                self.tray._by_uuid[self._unique_id] = self
+
+    @property
+    def user_defined_id(self):
+        return self._user_defined_id
+
+    @user_defined_id.setter
+    def user_defined_id(self, value):
+        if self.tray:
+            index = self.tray._by_user_id
+            if index.get(self._user_defined_id) is self:
+                del index[self._user_defined_id]
+            if value is not None:
+                index[value] = self
+        self._user_defined_id = value
+        self._invalidate_summary()
 
     @property
     def used(self):
@@ -77,31 +159,44 @@ class BaseContainer:
         self._update_plate_json()
 
     
+    def _invalidate_summary(self):
+        """Drop the cached summary of this container and of its tray."""
+        self._summary_dirty = True
+        if self.tray:
+            self.tray._summary_cache = None
+
     def _update_plate_json(self):
-        """Update the tray JSON file with the current container information."""
+        """Mark the tray as modified; the JSON file is written on the next flush."""
+        self._summary_dirty = True
         if self.tray:
-            self.tray.save_to_json()
+            self.tray.mark_dirty()
         else:
             pass
 
     def get_info(self):
         """Retrieve container information."""
+        if not self._summary_dirty:
+            return self.summary
+        # Cleared first so a change made while the summary is built marks it stale again
+        self._summary_dirty = False
         self.summary = {key: value for key, value in {
             "well_name": self.well_name,
             "tray_name": self.tray_name,
             "unique_id": self._unique_id,
-            "user_defined_id": self.user_defined_id,
-            "weight_history": dict(self.weight_history), # display as regular dict
+            "user_defined_id": self._user_defined_id,
+            "weight_history": dict(self.weight_history),
             "measured_weight": dict(self.measured_weight),
             "empty_weight_mg": self.empty_weight_mg,
         }.items() if value is not None}
         return self.summary
 
     def __repr__(self):
-        return self.get_info()
+        return f"{type(self).__name__}({self.well_name}@{self.tray_name})"
 
 
 class Container(BaseContainer):
+    __slots__ = ('mlh_location', 'gripper', 'contents', 'total_volume', 'min_volume_ml', 'max_volume_ml')
+
     def __init__(self,
                  well_name: str,
                  tray_name: str,
@@ -119,7 +214,7 @@ class Container(BaseContainer):
 
         self.mlh_location = mlh_location
         self.gripper = gripper
-        self.contents = OrderedDict()
+        self.contents = {}
         self.total_volume = 0.0
 
         self.min_volume_ml = volume_ml[0]
@@ -139,7 +234,8 @@ class Container(BaseContainer):
             self.contents[key] += value
         else:
             self.contents[key] = value
-        self.total_volume = sum(self.contents.values())
+        # total_volume always equals sum(contents.values()); update it incrementally
+        self.total_volume += value
 
         self._update_plate_json()
 
@@ -148,24 +244,31 @@ class Container(BaseContainer):
         if value < 0:
             raise ValueError("Minimum volume cannot be negative.")
         self.min_volume_ml = value
+        self._invalidate_summary()
 
     def get_info(self):
         """Retrieve container information."""
+        if not self._summary_dirty:
+            return self.summary
+        # Cleared first so a change made while the summary is built marks it stale again
+        self._summary_dirty = False
         self.summary = {key: value for key, value in {
             "well_name": self.well_name,
             "tray_name": self.tray_name,
             "unique_id": self._unique_id,
-            "user_defined_id": self.user_defined_id,
-            "weight_history": self.weight_history,
+            "user_defined_id": self._user_defined_id,
+            "weight_history": dict(self.weight_history),
             "total_volume": self.total_volume,
-            "contents": self.contents,
-            "units": self.units,
+            "contents": dict(self.contents),
+            "units": dict(self.units),
             "empty_weight_mg": self.empty_weight_mg,
         }.items() if value is not None}
         return self.summary
 
 
 class vial_stock(Container):
+    __slots__ = ('cap', 'layer', 'lc_data_dir', 'lc_peaks', 'sampled_from', 'lc_instrument_parameters')
+
     def __init__(self,
                  well_name: str,
                  tray_name: str,
@@ -197,6 +300,7 @@ class vial_stock(Container):
         if not isinstance(state, bool):
             raise ValueError("State must be a boolean value.")
         self.cap = state
+        self._invalidate_summary()
 
     def add_layer_aliquot(self, layer: str, volume: Union[float, int]):
         """Add an aliquot of a layer from the extraction vial
@@ -238,6 +342,8 @@ class vial_stock(Container):
 
 
 class vial_sample(BaseContainer):
+    __slots__ = ('min_volume_ml', 'max_volume_ml', 'total_volume', 'solvent_name')
+
     def __init__(self,
                  well_name: str,
                  tray_name: str,
@@ -260,19 +366,23 @@ class vial_sample(BaseContainer):
         """Track the volume of the solvent."""
         if volume_ml < 0:
             raise ValueError("Volume cannot be negative.")
-        available_volume = self.max_volume_ml - self.total_volume
-        if volume_ml > available_volume:
+        total_volume = self.total_volume
+        if volume_ml > self.max_volume_ml - total_volume:
             raise ValueError("Volume exceeds available capacity.")
 
-        self.total_volume = + volume_ml
+        self.total_volume = total_volume + volume_ml
+        self._invalidate_summary()
 
     def add_solvent_info(self, solvent_name, user_id):
         """Add solvent information."""
         self.solvent_name = solvent_name
         self.user_defined_id = user_id
+        self._invalidate_summary()
 
 
 class dose_stock(Container):
+    __slots__ = ('lc_vials', 'video_files')
+
     def __init__(self,
                  well_name: str,
                  tray_name: str,
@@ -296,11 +406,15 @@ class dose_stock(Container):
 
     def add_lc_vial(self, layer: str, well_name: str):
         self.lc_vials[layer] = well_name
+        self._invalidate_summary()
 
     def add_video_files(self, recording: str, file_name: str):
         self.video_files[recording] = file_name
+        self._invalidate_summary()
         
 class dose_stock_back(Container):
+    __slots__ = ('lc_vials', 'video_files')
+
     def __init__(self,
                  well_name: str,
                  tray_name: str,
@@ -324,11 +438,15 @@ class dose_stock_back(Container):
 
     def add_lc_vial(self, layer: str, well_name: str):
         self.lc_vials[layer] = well_name
+        self._invalidate_summary()
 
     def add_video_files(self, recording: str, file_name: str):
         self.video_files[recording] = file_name
+        self._invalidate_summary()
 
 class Holder:
+    __slots__ = ('well_name', 'location', 'mlh_location', 'container', 'used', 'tray')
+
     def __init__(self,
                  well_name: str,
                  location: Location,
@@ -339,6 +457,7 @@ class Holder:
         self.mlh_location = mlh_location
         self.container = None
         self.used = False  # assume all containers are not used at the beginning
+        self.tray = None
 
     def add_container(self, container: BaseContainer):
         """Add a container to the holder."""
@@ -363,14 +482,26 @@ class Tray:
     def __init__(self,
                  tray_name: str,
                  wells: List[Union[BaseContainer, Holder]],
-                 log_filename: str = datetime.now().strftime('%Y%m%d_%H%M%S'),
-                 path: str = './'):
+                 log_filename: str = None,
+                 path: str = './',
+                 flush_delay: float = 0.5):
         self.tray_name = tray_name
         self.wells = {container.well_name: container for container in wells}
-        self.well_names = list(self.wells.keys())
-        self.save_directory = path
-        self.filename = log_filename
-        self.json_file = f"{ self.save_directory}{self.filename}_{tray_name}.json"
+        # Evaluated per tray; a default argument would be frozen at import time
+        self.filename = log_filename or datetime.now().strftime('%Y%m%d_%H%M%S')
+        self.save_directory = path if path is not None else './'
+        self._update_json_file()
+        # Writes are coalesced: mutations only set _dirty, and the file is
+        # saved by flush() (debounced timer, context exit, or explicit call)
+        self.flush_delay = flush_delay
+        self._dirty = False
+        self._flush_timer = None
+        self._flush_lock = threading.Lock()
+        self._defer_depth = 0
+        self._summary_cache = None
+        # id -> container indexes, kept current by BaseContainer as ids are assigned
+        self._by_user_id = {}
+        self._by_uuid = {}
         self._add_plate()
         # Save the initial state to a JSON file
 
@@ -387,7 +518,7 @@ class Tray:
         """Create a tray from a dictionary of well_name to locations."""
 
         wells = {}
-        init_params = inspect.signature(container_class.__init__).parameters
+        init_params = _init_param_names(container_class)
 
         if mlh_locations:
             if set(locations.keys()) != set(mlh_locations.keys()):
@@ -395,57 +526,64 @@ class Tray:
         else:
             mlh_locations = {key: None for key in locations.keys()}
 
-        for well, location in locations.items():
-            mlh_location = mlh_locations.get(well)
-
-            # Base arguments
-            container_args = {
-                "well_name": well,
+        # Resolve which arguments the container class accepts once, not per well
+        if container_class == Holder:
+            base_args = {}
+            has_mlh = True
+        else:
+            base_args = {
                 "tray_name": tray_name,
-                "location": location,
                 "needle_depth": needle_depth,
             }
-
             # Include anything else passed via **kwargs if relevant
-            for key, val in kwargs.items():
-                if key in init_params:
-                    container_args[key] = val
-
-            if 'mlh_location' in init_params:
-                container_args['mlh_location'] = mlh_location
+            base_args.update({key: val for key, val in kwargs.items() if key in init_params})
             if 'gripper' in init_params:
-                container_args['gripper'] = gripper
+                base_args['gripper'] = gripper
             if 'volume_ml' in init_params:
-                container_args['volume_ml'] = volume_ml
+                base_args['volume_ml'] = volume_ml
+            has_mlh = 'mlh_location' in init_params
 
-            if container_class == Holder:
-                container_args = {
-                    "well_name": well,
-                    "location": location,
-                    "mlh_location": mlh_location
-                }
+        for well, location in locations.items():
+            container_args = {**base_args, "well_name": well, "location": location}
+            if has_mlh:
+                container_args['mlh_location'] = mlh_locations.get(well)
 
             wells[well] = container_class(**container_args)
 
         return cls(tray_name=tray_name, wells=list(wells.values()), **kwargs)
 
+    @property
+    def well_names(self):
+        """Live view of the well names in grid order."""
+        return self.wells.keys()
+
+    def _update_json_file(self):
+        self.json_file = os.path.join(self.save_directory, f"{self.filename}_{self.tray_name}.json")
+
     def update_file_directory(self, path: str):
         self.save_directory = path
-# add 
+        self._update_json_file()
+
     def update_filename(self, filename: str):
         self.filename = filename
+        self._update_json_file()
 
     def _add_plate(self):
         """Add the plate to the tray."""
         for container in self.wells.values():
             container.tray = self
+            user_defined_id = getattr(container, 'user_defined_id', None)
+            if user_defined_id is not None:
+                self._by_user_id[user_defined_id] = container
+            unique_id = getattr(container, 'unique_id', None)
+            if unique_id is not None:
+                self._by_uuid[unique_id] = container
 
     def _get_index_from_name(self, name: str) -> Union[int, str]:
         """Get the index of a container by its user_defined_id"""
-        for w in self.wells.values():
-            if name == w.user_defined_id:
-                return w
-        else:
+        try:
+            return self._by_user_id[name]
+        except KeyError:
             raise ValueError(f"{name} container not found in tray.")
 
     def get_next_available(self) -> Union[BaseContainer, None]:
@@ -457,22 +595,22 @@ class Tray:
 
     def mark_used(self, container: BaseContainer, used: bool):
         """Update the used status of a container."""
-        if container.well_name in self.wells:
-            self.wells[container.well_name].used = used
+        if self.wells.get(container.well_name) is container:
+            container.used = used
         else:
             raise ValueError("The specified container is not part of this tray.")
 
     def add_content(self, container: BaseContainer, key: str, value: float):
         """Add content to a specific container."""
-        if container.well_name in self.wells:
-            self.wells[container.well_name].add_content(key, value)
+        if self.wells.get(container.well_name) is container:
+            container.add_content(key, value)
         else:
             raise ValueError("The specified container is not part of this tray.")
 
     def add_weight_measurement(self, container: BaseContainer, sample_name: str, weight: float):
         """Update the weight history of a specific container."""
-        if container.well_name in self.wells:
-            self.wells[container.well_name].add_weight_measurement(sample_name, weight)
+        if self.wells.get(container.well_name) is container:
+            container.add_weight_measurement(sample_name, weight)
         else:
             raise ValueError("The specified container is not part of this tray.")
 
@@ -483,8 +621,7 @@ class Tray:
         
         path = "./solvent_library/"  # Fixed path to the folder where this module is saved
 
-        with open(f"{path}{filename}", "r") as f:
-            data = json.load(f)['solvents']
+        data = _load_solvents(f"{path}{filename}")
         
         for k,v in data.items():
             if k in self.wells:
@@ -493,10 +630,13 @@ class Tray:
     def get_summary(self, print_summary: bool = False, save: bool = False, filename: str = None):
         """Display tray information and optionally save it to a JSON file."""
 
-        tray_info = {
-            "tray_name": self.tray_name,
-            "containers": {well: container.get_info() for well, container in self.wells.items()}
-        }
+        tray_info = self._summary_cache
+        if tray_info is None:
+            tray_info = {
+                "tray_name": self.tray_name,
+                "containers": {well: container.get_info() for well, container in self.wells.items()}
+            }
+            self._summary_cache = tray_info
 
         if print_summary:
             pprint.pprint(tray_info)
@@ -507,15 +647,87 @@ class Tray:
                 file = f"{date}_{self.tray_name}_summary"
             else:
                 file = filename
-            with open(f"{file}.json", "w") as f:
-                json.dump(tray_info, f, indent=4)
+            with open(f"{file}.json", "wb") as f:
+                f.write(_encode_json(tray_info))
 
         return tray_info
 
     def save_to_json(self):
-        """Save plate summary to a JSON file."""
-        with open(self.json_file, "w") as f:
-            json.dump(self.get_summary(), f, indent=4)
+        """Save plate summary to a JSON file.
+
+        The summary is encoded in one shot and written to a sibling temp file that
+        atomically replaces the previous file, so a crash never leaves it truncated.
+        """
+        data = _encode_json(self.get_summary())
+        tmp_file = f"{self.json_file}.tmp"
+        with open(tmp_file, "wb") as f:
+            f.write(data)
+        os.replace(tmp_file, self.json_file)
+
+    def mark_dirty(self):
+        """Flag the tray as modified and schedule a debounced flush."""
+        with self._flush_lock:
+            self._dirty = True
+            self._summary_cache = None
+            _open_trays.add(self)
+            if self._defer_depth > 0 or self.flush_delay is None or self._flush_timer is not None:
+                return
+            self._flush_timer = threading.Timer(self.flush_delay, self._debounced_flush)
+            self._flush_timer.daemon = True
+            self._flush_timer.start()
+
+    def _debounced_flush(self):
+        """Timer callback; leaves the write to defer_writes() if a block is open."""
+        with self._flush_lock:
+            if self._defer_depth > 0:
+                self._flush_timer = None
+                return
+        try:
+            self.flush()
+        except Exception:
+            # The tray stays dirty, so the next flush (or the one at exit) retries the write
+            logger.exception("Failed to write %s", self.json_file)
+
+    def flush(self):
+        """Write the tray JSON file if anything changed since the last write."""
+        with self._flush_lock:
+            if self._flush_timer is not None:
+                self._flush_timer.cancel()
+                self._flush_timer = None
+            if not self._dirty:
+                return
+            # Cleared only once the file is written, so a failed write is retried
+            self.save_to_json()
+            self._dirty = False
+            _open_trays.discard(self)
+
+    @contextmanager
+    def defer_writes(self):
+        """Suppress tray writes inside the block and write once when the outermost block exits."""
+        self._begin_deferred()
+        try:
+            yield self
+        finally:
+            self._end_deferred()
+
+    def _begin_deferred(self):
+        with self._flush_lock:
+            self._defer_depth += 1
+
+    def _end_deferred(self):
+        """Leave a deferred block; the outermost one flushes (outside the lock, which flush() takes)."""
+        with self._flush_lock:
+            self._defer_depth -= 1
+            outermost = self._defer_depth == 0
+        if outermost:
+            self.flush()
+
+    def __enter__(self):
+        self._begin_deferred()
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        self._end_deferred()
 
     def __getitem__(self, key: Union[str, int]) -> BaseContainer:
         """Retrieve a container by well_name, unique_id, or index."""
@@ -526,9 +738,8 @@ class Tray:
             if key in self.wells:
                 return self.wells[key]
             # Search by unique_id
-            for container in self.wells.values():
-                if container.unique_id == key:
-                    return container
+            if key in self._by_uuid:
+                return self._by_uuid[key]
         raise KeyError(f"No container found for key: {key}")
 
     def __repr__(self):
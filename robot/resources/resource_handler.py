@@ -1,6 +1,7 @@
 from .containers import Tray, vial_stock, dose_stock, vial_sample, dose_stock_back
 from robot.ur5_rtde_gripper import Location
 from typing import Tuple
+import numpy as np
 
 # Simple local implementation to replace hein_robots dependencies
 Cartesian = Tuple[float, float]  # Type alias for (x, y) coordinates
@@ -63,9 +64,9 @@ class Handler:
             pass
 
         # Create Location with position=[x,y,z] and orientation=[rx,ry,rz] format
-        new_position = [location[0] + x, location[1] + y, location[2] + z]
-        new_orientation = [location[3], location[4], location[5]]
-        new_location = Location(position=new_position, orientation=new_orientation)
+        # (Location copies both sequences, so pass the orientation slice as is)
+        new_position = (location[0] + x, location[1] + y, location[2] + z)
+        new_location = Location(position=new_position, orientation=location[3:6])
         
         return new_location
     # convert list with coordinate into location - can add option to keep using the list (will give more flexibility)
@@ -82,20 +83,41 @@ class Handler:
         :param spacing: the spacing
         """
 
-        grid_columns = string.ascii_uppercase[:columns]
-        grid_rows = range(1,rows+1)
-        
-        grid_dict = {}
-
-        for i, r in enumerate(grid_columns):
-            x_diff = -spacing[0] * i  # B1 is in negative X direction from A1
-            for c in grid_rows:
-                y_diff = -spacing[1] * (c-1)  # A2 is in negative Y direction from A1
-                key = f"{r}{c}"
-                grid_dict[key] = self._translate(A1_vial_location, x=x_diff, y=y_diff)
-                
+        keys, positions, orientation = self._grid_positions(A1_vial_location, rows, columns, spacing)
+        grid_dict = dict(zip(keys, (Location(position=position, orientation=orientation)
+                                    for position in positions.tolist())))
+
         return grid_dict
 
+    def make_pose_table(self, A1_vial_location, rows: int, columns: int, spacing: tuple):
+        """
+        Same grid as create_grid, stored as one (rows*columns, 6) float64 array of mm/deg poses
+        plus a well name -> row index dict, for hot paths that only need coordinates.
+        """
+        keys, positions, orientation = self._grid_positions(A1_vial_location, rows, columns, spacing)
+        poses = np.empty((len(keys), 6), dtype=np.float64)
+        poses[:, :3] = positions
+        poses[:, 3:] = orientation
+        return poses, {key: i for i, key in enumerate(keys)}
+
+    @staticmethod
+    def _grid_positions(A1_vial_location, rows: int, columns: int, spacing: tuple):
+        """Well names, (N, 3) positions and the shared orientation of a grid."""
+        if isinstance(A1_vial_location, dict):
+            A1_vial_location = A1_vial_location['l']
+        # The orientation is the same for every well; slice it once for the whole grid
+        orientation = A1_vial_location[3:6]
+
+        # Offsets for every (column, row) cell computed in one broadcast:
+        # B1 is in negative X direction from A1, A2 is in negative Y direction from A1
+        offsets = np.zeros((columns, rows, 3))
+        offsets[..., 0] = -spacing[0] * np.arange(columns)[:, None]
+        offsets[..., 1] = -spacing[1] * np.arange(rows)[None, :]
+        positions = (np.asarray(A1_vial_location[:3], dtype=float) + offsets).reshape(-1, 3)
+
+        keys = [f"{r}{c}" for r in string.ascii_uppercase[:columns] for c in range(1, rows + 1)]
+        return keys, positions, orientation
+
     def initialize_tray(self, tray_name, locations, file_directory: str = None):
         container_type = self.CONTAINER_INFO[tray_name]
         tray_args = {
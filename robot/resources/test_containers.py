@@ -0,0 +1,78 @@
+"""Tray JSON persistence: coalesced writes reach the file on flush() and defer_writes() exit."""
+import json
+
+import pytest
+
+from robot.resources.containers import Container, Tray
+
+
+def make_tray(tmp_path, flush_delay=None):
+    wells = [
+        Container(well_name=name, tray_name="stock", needle_depth={}, location=None,
+                  mlh_location=None, gripper={}, volume_ml=[0, 20])
+        for name in ("A1", "A2")
+    ]
+    return Tray(tray_name="stock", wells=wells, log_filename="test", path=str(tmp_path),
+                flush_delay=flush_delay)
+
+
+def read_tray(tray):
+    with open(tray.json_file) as f:
+        return json.load(f)["containers"]
+
+
+def test_flush_writes_pending_change(tmp_path):
+    tray = make_tray(tmp_path)
+    tray.add_weight_measurement(tray["A1"], "empty", 100.0)
+    tray.flush()
+    assert read_tray(tray)["A1"]["weight_history"] == {"empty": 100.0}
+
+
+def test_defer_writes_writes_once_on_exit(tmp_path):
+    tray = make_tray(tmp_path, flush_delay=0.01)
+    with tray.defer_writes():
+        tray.add_weight_measurement(tray["A1"], "empty", 100.0)
+        tray.add_weight_measurement(tray["A1"], "dosed", 150.0)
+        assert not (tmp_path / "test_stock.json").exists()
+    assert read_tray(tray)["A1"]["weight_history"] == {"empty": 100.0, "dosed": 150.0}
+
+
+def test_failed_write_is_retried(tmp_path, monkeypatch):
+    tray = make_tray(tmp_path)
+    tray.add_weight_measurement(tray["A1"], "empty", 100.0)
+
+    def fail():
+        raise OSError("disk full")
+
+    monkeypatch.setattr(tray, "save_to_json", fail)
+    with pytest.raises(OSError):
+        tray.flush()
+    monkeypatch.undo()
+    tray.flush()
+    assert read_tray(tray)["A1"]["weight_history"] == {"empty": 100.0}
+
+
+def test_summary_is_a_snapshot(tmp_path):
+    tray = make_tray(tmp_path)
+    tray.add_weight_measurement(tray["A1"], "empty", 100.0)
+    summary = tray.get_summary()
+    tray["A1"].weight_history["late"] = 1.0
+    assert summary["containers"]["A1"]["weight_history"] == {"empty": 100.0}
+
+
+def test_summary_file_uses_tray_layout(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    tray = make_tray(tmp_path)
+    tray.add_weight_measurement(tray["A1"], "empty", 100.0)
+    tray.flush()
+    tray.get_summary(save=True, filename="summary")
+    assert (tmp_path / "summary.json").read_bytes() == (tmp_path / "test_stock.json").read_bytes()
+
+
+def test_tray_context_defers_writes(tmp_path):
+    tray = make_tray(tmp_path, flush_delay=0.01)
+    with tray:
+        with tray.defer_writes():
+            tray.add_weight_measurement(tray["A1"], "empty", 100.0)
+        assert not (tmp_path / "test_stock.json").exists()
+    assert read_tray(tray)["A1"]["weight_history"] == {"empty": 100.0}
@@ -1,23 +1,40 @@
 from typing import Dict, Union
+import functools
+import logging
 import os
 from math import ceil
+import math
 import socket
 import time
 import json
 import numpy as np
 from pathlib import Path
-from robot.ur5_rtde_gripper import URArm
+from robot.ur5_rtde_gripper import URArm, Location
 from robot.resources.resource_handler import Handler
 from robot.utils import (
     logger, configure_global_exception_handler, component_manager
 )
 from dotenv import load_dotenv
 
+try:
+    import orjson
+except ImportError:  # fall back to the stdlib parser
+    orjson = None
+
 load_dotenv()
 
 vial_stock_depth = -52 #distance in mm from prep to vial grip point
 dose_stock_depth = 50 #distance in mm from prep to dose grip point
 
+# Grid geometry of each tray: location of its A1 well, rows, columns and spacing (mm).
+# Both the tray containers and the pose tables are built from these, so they can't drift apart.
+TRAY_GEOMETRY = {
+    "vial_stock": {"origin": "vial_stock", "rows": 6, "columns": 4, "spacing": (20, 20)},
+    "dose_stock": {"origin": "dose_stock", "rows": 5, "columns": 1, "spacing": (45, 45)},
+    "dose_stock_back": {"origin": "dose_stock_back", "rows": 5, "columns": 1, "spacing": (45, 45)},
+    "vial_sample": {"origin": "prep_drop_ot", "rows": 4, "columns": 6, "spacing": (20, 20)},
+}
+
 
 class URController:
 
@@ -25,87 +42,95 @@ class URController:
     def __init__(self, ur3_ip=None, gripper_connect:bool = True, location_settings: Dict = None, location_file="ur3_1006_locations_converted.json"):
         if ur3_ip is None:
             ur3_ip = os.environ.get("ROBOT_IP")
+        # Resolve the component logger once instead of on every log call
+        self._logger = (component_manager.component_loggers.get("URController")
+                        or component_manager._create_component_logger("URController"))
+        component_manager.component_loggers["URController"] = self._logger
         self._gripper_item = None
         self._rob_loc = None
+        self._last_target_pose = None  # mm/deg pose reached by the last linear move
+        # Reused buffers for relative movel offsets
+        self._delta_pose = np.empty(6, dtype=np.float64)
+        self._scratch_pose = np.empty(6, dtype=np.float64)
         self.gripper_dist = {
             "open": {"vial": 0.81, "dose": 0.65},
             "close": {"vial": 0.95, "dose": 0.70}
         }
-        self._load_location_settings(location_settings if location_settings is not None else None)
+        self._load_location_settings(location_settings, location_file)
         self._connect_rob(ur3_ip, gripper_connect)
         self._initialize_trays()
 
 
-    def _log_debug(self, message: str):
-        """Log debug message to component logger if available, otherwise to main logger."""
-        comp_logger = component_manager.component_loggers.get("URController")
-        if comp_logger:
-            comp_logger.debug(message)
-        else:
-            # Create the component logger if it doesn't exist yet
-            if "URController" not in component_manager.component_loggers:
-                component_manager.component_loggers["URController"] = component_manager._create_component_logger("URController")
-            comp_logger = component_manager.component_loggers.get("URController")
-            if comp_logger:
-                comp_logger.debug(message)
-            else:
-                logger.debug(message)
+    def _log_debug(self, message: str, *args):
+        """Log debug message to the URController component logger (%-style args are formatted lazily)."""
+        self._logger.debug(message, *args)
     
-    def _log_error(self, message: str):
-        """Log error message to component logger if available, otherwise to main logger."""
-        comp_logger = component_manager.component_loggers.get("URController")
-        if comp_logger:
-            comp_logger.error(message)
-        else:
-            # Create the component logger if it doesn't exist yet
-            if "URController" not in component_manager.component_loggers:
-                component_manager.component_loggers["URController"] = component_manager._create_component_logger("URController")
-            comp_logger = component_manager.component_loggers.get("URController")
-            if comp_logger:
-                comp_logger.error(message)
-            else:
-                logger.error(message)
+    def _log_error(self, message: str, *args):
+        """Log error message to the URController component logger (%-style args are formatted lazily)."""
+        self._logger.error(message, *args)
     
-    def _load_location_settings(self, settings: Dict = None) -> None:
-        """Load robot position settings from JSON file or dict."""
+    def _load_location_settings(self, settings: Dict = None, location_file: str = "ur3_1006_locations_converted.json") -> None:
+        """Load robot position settings from JSON file (relative to this module) or dict."""
         if settings is None:
-            path_to_locations = os.path.join(os.path.dirname(__file__), 'ur3_1006_locations_converted.json')
-            with open(path_to_locations, 'r') as f:
-                settings = json.load(f)
+            path_to_locations = os.path.join(os.path.dirname(__file__), location_file)
+            with open(path_to_locations, 'rb') as f:
+                settings = orjson.loads(f.read()) if orjson is not None else json.load(f)
         self.loc = settings["rob_locations"]
+        # Resolve named poses to float64 arrays once so movej/movel only do a dict lookup
+        self._loc_j = {name: np.asarray(loc["j"], dtype=np.float64)
+                       for name, loc in self.loc.items() if len(loc.get("j") or ()) == 6}
+        self._loc_l = {name: np.asarray(loc["l"], dtype=np.float64)
+                       for name, loc in self.loc.items() if len(loc.get("l") or ()) == 6}
+        invalid = sorted(set(self.loc) - (self._loc_j.keys() & self._loc_l.keys()))
+        if invalid:
+            self._logger.warning(f"Locations with missing or invalid 'j'/'l' data: {invalid}")
     
     def _connect_rob(self, rob_ip:str, gripper_connect:bool):
         self.rob = URArm(rob_ip, gripper_connect=gripper_connect)
+
+    def disconnect(self):
+        """Close the RTDE interfaces and the persistent gripper socket."""
+        self.rob.disconnect()
     
 
     def gripper_pos(self, distance: float):
         self.rob.close_gripper(position=distance)
         self._gripper_pos = distance
-        self._log_debug(f"Successfully set gripper position to {distance}")
+        self._log_debug("Successfully set gripper position to %s", distance)
+
+    def gripper_pos_async(self, distance: float):
+        """Start a gripper move without blocking; returns a Future that resolves when the fingers stop."""
+        future = self.rob.gripper.move_async(distance, force=self.rob._gripper_default_force,
+                                             velocity=self.rob._gripper_default_velocity)
+        self._gripper_pos = distance
+        self._log_debug("Started gripper move to position %s", distance)
+        return future
 
     def activate_gripper(self):
         """Activate the gripper using the URArm's RobotiqGripper interface."""
         try:
             self.rob.gripper.set_registers({'ACT': 1})
-            time.sleep(0.5)
+            self.rob.gripper.wait_for_activation()
             self._log_debug("Gripper activated.")
         except Exception as e:
-            self._log_error(f"Gripper activation error: {e}")
+            self._log_error("Gripper activation error: %s", e)
 
     def _initialize_trays(self):
         """Initialize workspace tray layouts for current workflow."""
         self.resource_handler = Handler()
-        self.vial_stock = self.resource_handler.make_tray(
-            self.loc['vial_stock'], rows=6, columns=4, spacing=(20, 20), tray_name="vial_stock")
-
-        self.dose_stock = self.resource_handler.make_tray(
-            self.loc['dose_stock'], rows=5, columns=1, spacing=(45, 45), tray_name="dose_stock")
-        
-        self.dose_stock_back = self.resource_handler.make_tray(
-            self.loc['dose_stock_back'], rows=5, columns=1, spacing=(45, 45), tray_name="dose_stock_back")
+        # Pose tables for the motion hot path: one array row per well instead of tray -> container -> Location
+        self.vial_stock, (self._vial_stock_pos, self._vial_idx) = self._make_tray("vial_stock")
+        self.dose_stock, (self._dose_stock_pos, self._dose_idx) = self._make_tray("dose_stock")
+        self.dose_stock_back, _ = self._make_tray("dose_stock_back")
+        self.vial_sample, (self._vial_sample_pos, self._vial_sample_idx) = self._make_tray("vial_sample")
 
-        self.vial_sample = self.resource_handler.make_tray(
-            self.loc['prep_drop_ot'], rows=4, columns=6, spacing=(20, 20), tray_name="vial_sample")
+    def _make_tray(self, tray_name: str):
+        """Build a tray and its (poses, well index) pose table from the same TRAY_GEOMETRY entry."""
+        geometry = TRAY_GEOMETRY[tray_name]
+        origin = self.loc[geometry["origin"]]
+        grid = {key: geometry[key] for key in ("rows", "columns", "spacing")}
+        tray = self.resource_handler.make_tray(origin, tray_name=tray_name, **grid)
+        return tray, self.resource_handler.make_pose_table(origin, **grid)
 
 
 
@@ -113,40 +138,99 @@ class URController:
         # # Debug RTDE connection status
         # rtde_connected = (self.rob.rtde_r is not None) and (self.rob.rtde_c is not None)
         # self._log_debug(f"RTDE connected: {rtde_connected}")
+        # Skip the RTDE reads and formatting entirely when nothing would be logged
+        if not self._logger.isEnabledFor(logging.DEBUG):
+            return
         current_joints = self.rob.get_joints()
         current_pose = self.rob.get_tcp_pose()
         # Log each line separately to ensure proper timestamps
         self._log_debug("Robot position: {")
-        self._log_debug(f'"l": {[float(round(x, 2)) for x in current_pose]},')
-        self._log_debug(f'"j": {[float(round(x, 2)) for x in current_joints]}')
+        self._log_debug('"l": %s,', [float(round(x, 2)) for x in current_pose])
+        self._log_debug('"j": %s', [float(round(x, 2)) for x in current_joints])
         self._log_debug("}")
     
 
-    def movej(self, pos, vel: float = 30, acc: float = None, asynchronous=False, verify_position=True):
-        """Move robot joints to specified position with tracking and collision detection."""
-        self._log_debug(f"movej: Moving to {pos} at velocity {vel} mm/s")
+    def movej(self, pos, vel: float = 30, acc: float = None, asynchronous=False, verify_position=True, wait=False):
+        """Move robot joints to specified position with tracking and collision detection.
+
+        Synchronous moves return once ur_rtde reports the move finished. For asynchronous
+        moves, ``wait=True`` polls the controller until the arm is steady.
+        """
+        self._log_debug("movej: Moving to %s at velocity %s mm/s", pos, vel)
         
         if isinstance(pos, str):
-            loc = self.loc.get(pos)
-            if not loc or "j" not in loc or len(loc["j"]) != 6:
-                self._log_error(f"Location '{pos}' not found or invalid joint data.")
+            joints = self._loc_j.get(pos)
+            if joints is None:
+                self._log_error("Location '%s' not found or invalid joint data.", pos)
                 return False
-            joints = loc["j"]
-            self._log_debug(f"movej: Resolved position '{pos}' to joints: {joints}")
+            self._log_debug("movej: Resolved position '%s' to joints: %s", pos, joints)
         else:
             joints = pos
-            self._log_debug(f"movej: Using direct joint values: {joints}")
+            self._log_debug("movej: Using direct joint values: %s", joints)
             
         # Execute movement
-        self._log_debug(f"movej: Executing robot movement to joints: {joints}")
+        self._log_debug("movej: Executing robot movement to joints: %s", joints)
+        self._last_target_pose = None
         self.rob.movej(joints, velocity=vel, acceleration=acc, async_move=asynchronous)
         
+        if asynchronous and wait:
+            self.rob.wait_until_steady()
+
         self._rob_loc = pos if isinstance(pos, str) else None
-        time.sleep(1)
         # self.print_lj()
-        self._log_debug(f"movej: Successfully completed movement to {pos}")
+        self._log_debug("movej: Successfully completed movement to %s", pos)
         return True
 
+    def _current_pose(self):
+        """Current TCP pose, reusing the last linear target while the arm is parked there."""
+        if self._last_target_pose is not None and self.rob.rtde_c.isSteady():
+            return self._last_target_pose
+        return self.rob.get_tcp_pose()
+
+    @functools.singledispatchmethod
+    def _resolve_pose(self, pos):
+        """Resolve a pose object to a mm/deg pose; concrete types are registered below.
+
+        This fallback handles duck-typed Location-like objects.
+        """
+        if hasattr(pos, 'position') and hasattr(pos, 'orientation'):
+            target_pose = list(pos.position) + list(pos.orientation)
+        elif hasattr(pos, 'x') and hasattr(pos, 'y') and hasattr(pos, 'z') and hasattr(pos, 'rx') and hasattr(pos, 'ry') and hasattr(pos, 'rz'):
+            # Accept hein_robots.robotics.Location or compatible object
+            target_pose = [pos.x, pos.y, pos.z, pos.rx, pos.ry, pos.rz]
+        else:
+            error_msg = f"Invalid pose format: {type(pos).__name__}. Must be a 6-element list, tuple, or Location object."
+            self._log_error(error_msg)
+            return list(pos)
+        self._log_debug("movel: Using Location object pose: %s", target_pose)
+        return target_pose
+
+    @_resolve_pose.register
+    def _(self, pos: str):
+        self._log_debug("movel: Looking up position '%s'", pos)
+        target_pose = self._loc_l.get(pos)
+        if target_pose is None:
+            self._log_error("Location '%s' not found or invalid pose data.", pos)
+        return target_pose
+
+    @_resolve_pose.register
+    def _(self, pos: Location):
+        # Location object with position=[x,y,z] and orientation=[rx,ry,rz] format
+        target_pose = pos.position + pos.orientation
+        self._log_debug("movel: Using Location object pose: %s", target_pose)
+        return target_pose
+
+    @_resolve_pose.register(list)
+    @_resolve_pose.register(tuple)
+    @_resolve_pose.register(np.ndarray)
+    def _(self, pos):
+        if len(pos) != 6:
+            error_msg = f"Invalid pose format: {type(pos).__name__}. Must be a 6-element list, tuple, or Location object."
+            self._log_error(error_msg)
+        target_pose = list(pos)
+        self._log_debug("movel: Using direct pose values: %s", target_pose)
+        return target_pose
+
     def movel(self, pos=None, x: float = 0, y: float = 0, z: float = 0, rx: float = 0, ry: float = 0, rz: float = 0, vel: float = 100, acc: float = None, asynchronous=False):
         """
         Move linearly to a pose using RTDEControlInterface.moveL.
@@ -155,103 +239,255 @@ class URController:
         - If pos is a Location object, use its values as a 6-element list.
         - If pos is None, move relative to current TCP pose by (x, y, z, rx, ry, rz).
         """
-        if isinstance(pos, str):
-            self._log_debug(f"movel: Looking up position '{pos}'")
-            loc = self.loc.get(pos, {})
-            target_pose = loc.get("l")
-            if not target_pose or len(target_pose) != 6:
-                self._log_error(f"Location '{pos}' not found or invalid pose data.")
-                return
-        elif pos is None:
-            self._log_debug(f"movel: Relative movement - offset: x={x}, y={y}, z={z}, rx={rx}, ry={ry}, rz={rz}")
-            current_pose = self.rob.get_tcp_pose()
-            target_pose = [
-                current_pose[0] + x,
-                current_pose[1] + y,
-                current_pose[2] + z,
-                current_pose[3] + rx,
-                current_pose[4] + ry,
-                current_pose[5] + rz
-            ]
-        elif hasattr(pos, 'position') and hasattr(pos, 'orientation'):
-            # Accept Location object with position=[x,y,z] and orientation=[rx,ry,rz] format
-            target_pose = pos.position + pos.orientation
-            self._log_debug(f"movel: Using Location object pose: {target_pose}")
-        elif hasattr(pos, 'x') and hasattr(pos, 'y') and hasattr(pos, 'z') and hasattr(pos, 'rx') and hasattr(pos, 'ry') and hasattr(pos, 'rz'):
-            # Accept hein_robots.robotics.Location or compatible object
-            target_pose = [pos.x, pos.y, pos.z, pos.rx, pos.ry, pos.rz]
-            self._log_debug(f"movel: Using Location object pose: {target_pose}")
+        if pos is None:
+            self._log_debug("movel: Relative movement - offset: x=%s, y=%s, z=%s, rx=%s, ry=%s, rz=%s", x, y, z, rx, ry, rz)
+            self._delta_pose[:] = (x, y, z, rx, ry, rz)
+            np.add(self._current_pose(), self._delta_pose, out=self._scratch_pose)
+            target_pose = self._scratch_pose.tolist()
         else:
-            if not isinstance(pos, (list, tuple)) or len(pos) != 6:
-                error_msg = f"Invalid pose format: {type(pos).__name__}. Must be a 6-element list, tuple, or Location object."
-                self._log_error(error_msg)
-            target_pose = list(pos)
-            self._log_debug(f"movel: Using direct pose values: {target_pose}")
+            target_pose = self._resolve_pose(pos)
+            if target_pose is None:
+                return
         
         # Execute robot movement
        
-        self._log_debug(f"movel: Executing linear movement at velocity {vel} mm/s")
+        self._log_debug("movel: Executing linear movement at velocity %s mm/s", vel)
+        self._last_target_pose = None
         self.rob.movel(target_pose, velocity=vel, acceleration=acc, async_move=asynchronous)
+        if not asynchronous:
+            self._last_target_pose = list(target_pose)
         self._rob_loc = pos if pos is not None else None
-        self.print_lj()
-        self._log_debug(f"movel: Successfully completed linear movement")
+        self.print_lj()  # no-op unless debug logging is enabled
+        self._log_debug("movel: Successfully completed linear movement")
             
 
 
+    def movel_path(self, waypoints, vel: float = 100, acc: float = None, blend: float = 5.0, asynchronous=False):
+        """
+        Move linearly through several waypoints in one blended trajectory instead of
+        stopping at each one.
+        - A waypoint is a location name, a Location object, a 6-element list/tuple, or a dict of
+          relative offsets (x, y, z, rx, ry, rz) applied to the previous waypoint (or the current
+          TCP pose for the first one).
+        - A (waypoint, vel) pair overrides the velocity of the segment leading to that waypoint.
+        - blend is the blend radius in mm at interior waypoints; it is reduced where segments are
+          too short for it, and the final waypoint is always reached exactly.
+        """
+        start_pose = self._current_pose()
+        poses, vels = [], []
+        previous = start_pose
+        for waypoint in waypoints:
+            seg_vel = vel
+            if isinstance(waypoint, tuple) and len(waypoint) == 2:
+                waypoint, seg_vel = waypoint
+            if isinstance(waypoint, dict):
+                pose = [previous[i] + waypoint.get(axis, 0) for i, axis in enumerate(("x", "y", "z", "rx", "ry", "rz"))]
+            else:
+                pose = self._resolve_pose(waypoint)
+                if pose is None:
+                    return
+            poses.append(list(pose))
+            vels.append(seg_vel)
+            previous = pose
+
+        # The controller rejects blend radii larger than half of an adjacent segment
+        points = [start_pose] + poses
+        blends = []
+        for i in range(1, len(points)):
+            radius = 0.45 * math.dist(points[i - 1][:3], points[i][:3])
+            if i + 1 < len(points):
+                radius = min(radius, 0.45 * math.dist(points[i][:3], points[i + 1][:3]))
+            blends.append(min(blend, radius))
+
+        self._log_debug("movel_path: Executing %d blended waypoints", len(poses))
+        self._last_target_pose = None
+        self.rob.movel_path(poses, vels, acceleration=acc, blends=blends, async_move=asynchronous)
+        if not asynchronous:
+            self._last_target_pose = poses[-1]
+        last = waypoints[-1][0] if isinstance(waypoints[-1], tuple) and len(waypoints[-1]) == 2 else waypoints[-1]
+        self._rob_loc = last if isinstance(last, str) else None
+        self._log_debug("movel_path: Successfully completed blended movement")
+
+    def run_sequence(self, steps, use_script: bool = False):
+        """
+        Execute a motion sequence given as a list of steps:
+        ("movej", target, vel), ("movel", target, vel), ("movel_path", waypoints, vel), ("gripper", position)
+        or ("gripper_async", position).
+        Targets take the same forms as movej/movel; a dict target is a relative offset.
+        A "gripper_async" step overlaps the gripper with the following moves; it is joined before the
+        next gripper step, before any relative move (relative moves are the close-in descents and
+        insertions around a part, which need the fingers in place) and at the end of the sequence.
+        Only use it where the fingers are not holding or releasing anything during the overlapped
+        moves (e.g. pre-opening on the approach).
+        - use_script=False runs each step from Python through movej/movel/movel_path/gripper_pos.
+        - use_script=True compiles the whole sequence into one URScript function and runs it on the
+          controller, so there is no Python round trip between moves.
+        """
+        if use_script:
+            self.run_script(self._compile_sequence(steps))
+            self._last_target_pose = None
+            last_target = next((step[1] for step in reversed(steps) if step[0] in ("movej", "movel")), None)
+            self._rob_loc = last_target if isinstance(last_target, str) else None
+            return
+
+        pending_gripper = None
+        for kind, *args in steps:
+            if pending_gripper is not None and (kind in ("gripper", "gripper_async") or self._is_relative_step(kind, args)):
+                pending_gripper.result()
+                pending_gripper = None
+            if kind == "movej":
+                self.movej(args[0], vel=args[1])
+            elif kind == "movel":
+                target, vel = args
+                if isinstance(target, dict):
+                    self.movel(vel=vel, **target)
+                else:
+                    self.movel(target, vel=vel)
+            elif kind == "movel_path":
+                self.movel_path(args[0], vel=args[1])
+            elif kind == "gripper":
+                self.gripper_pos(args[0])
+            elif kind == "gripper_async":
+                pending_gripper = self.gripper_pos_async(args[0])
+            else:
+                raise ValueError(f"Unknown sequence step: {kind}")
+        if pending_gripper is not None:
+            pending_gripper.result()
+
+    @staticmethod
+    def _is_relative_step(kind, args) -> bool:
+        """True for a movel/movel_path step with a relative (dict) target"""
+        if kind == "movel":
+            return isinstance(args[0], dict)
+        if kind == "movel_path":
+            return any(isinstance(wp[0] if isinstance(wp, tuple) else wp, dict) for wp in args[0])
+        return False
+
+    def run_script(self, script_body: str, function_name: str = "workflow_sequence"):
+        """Run a URScript function body on the controller and block until it finishes."""
+        self._log_debug("run_script: Sending %d lines of URScript", script_body.count("\n") + 1)
+        if not self.rob.rtde_c.sendCustomScriptFunction(function_name, script_body):
+            raise RuntimeError(f"URScript function '{function_name}' failed to run")
+
+    def _compile_sequence(self, steps) -> str:
+        """Translate run_sequence steps into a URScript function body (m, rad, rotation vectors)."""
+        gripper = self.rob.gripper
+        force = round(self.rob._gripper_default_force * 255)
+        speed = round(self.rob._gripper_default_velocity * 255)
+        lines = [f'socket_open("127.0.0.1", {gripper.port}, "gripper")']
+
+        def script_list(values):
+            return "[" + ", ".join(f"{float(v):.6f}" for v in values) + "]"
+
+        def movel_line(target, vel, blend=0.0):
+            if isinstance(target, dict):
+                if any(target.get(axis, 0) for axis in ("rx", "ry", "rz")):
+                    raise ValueError("Relative rotations are not supported in compiled sequences")
+                offset = [target.get(axis, 0) / 1000 for axis in ("x", "y", "z")] + [0, 0, 0]
+                pose_expr = f"pose_add(get_actual_tcp_pose(), p{script_list(offset)})"
+            else:
+                pose = self._resolve_pose(target)
+                if pose is None:
+                    raise ValueError(f"Location '{target}' not found or invalid pose data.")
+                pose_expr = f"p{script_list(self.rob._pose_to_m_rotvec(pose))}"
+            return f"movel({pose_expr}, a={2 * vel / 1000}, v={vel / 1000}, r={blend / 1000})"
+
+        gripper_wait = [
+            "sleep(0.1)",
+            'while socket_get_var("OBJ", "gripper") == 0:',
+            "  sleep(0.02)",
+            "end",
+        ]
+        gripper_pending = False
+        for kind, *args in steps:
+            if gripper_pending and self._is_relative_step(kind, args):
+                lines += gripper_wait
+                gripper_pending = False
+            if kind == "movej":
+                target, vel = args
+                joints = self._loc_j.get(target) if isinstance(target, str) else target
+                if joints is None:
+                    raise ValueError(f"Location '{target}' not found or invalid joint data.")
+                joints_rad = script_list(math.radians(j) for j in joints)
+                lines.append(f"movej({joints_rad}, a={math.radians(2 * vel)}, v={math.radians(vel)})")
+            elif kind == "movel":
+                lines.append(movel_line(*args))
+            elif kind == "movel_path":
+                waypoints, vel = args
+                for i, waypoint in enumerate(waypoints):
+                    seg_vel = vel
+                    if isinstance(waypoint, tuple) and len(waypoint) == 2:
+                        waypoint, seg_vel = waypoint
+                    # Blend radii need the absolute geometry, so compiled paths stop at each point
+                    lines.append(movel_line(waypoint, seg_vel))
+            elif kind in ("gripper", "gripper_async"):
+                position = round(args[0] * 255)
+                lines += [
+                    f'socket_send_line("SET POS {position} SPE {speed} FOR {force} GTO 1", "gripper")',
+                    'socket_read_byte_list(3, "gripper", 2)',  # "ack"
+                ]
+                gripper_pending = kind == "gripper_async"
+                if not gripper_pending:
+                    lines += gripper_wait
+            else:
+                raise ValueError(f"Unknown sequence step: {kind}")
+
+        lines.append('socket_close("gripper")')
+        return "\n".join(lines)
+
     def home(self):
         self.movej("safe_rack")
         self._rob_loc = "safe_rack"
 #Passed the test with tray update-2025/10/13
-    def vial_2_balance(self, vial_loc:str):
+    def vial_2_balance(self, vial_loc:str, use_script: bool = False):
         if self._rob_loc !="safe_rack":
             raise ValueError("start position should be 'safe_rack'")
-        self.gripper_pos(self.gripper_dist["open"]["vial"])
-        self.movel("vial_stock_prep")
-        empty_vial = self.vial_stock[vial_loc]
-        self.movel(empty_vial.location)
-        self.movel(z = -55, vel = 40)
-        self.gripper_pos(self.gripper_dist["close"]["vial"])
-        self._gripper_item = "vial"
-        self.movel(z = 55, vel=40)
-        self.movel("vial_stock_prep")
-        self.movej("safe_rack")
-        self.movej("home_prep_bal")
-        self.movej("safe_bal")
-        self.movel("prep_viap_drop",vel=40)
-        self.movel("drop_vial",vel=20)
-        self.gripper_pos(self.gripper_dist["open"]["vial"])
-        # print("[Debug] Opening gripper...")
+        open_vial = self.gripper_dist["open"]["vial"]
+        empty_vial_pose = self._vial_stock_pos[self._vial_idx[vial_loc]]
+        self.run_sequence([
+            ("gripper_async", open_vial),  # empty gripper: open while approaching the rack
+            ("movel", "vial_stock_prep", 100),
+            ("movel", empty_vial_pose, 100),
+            ("movel", {"z": -55}, 40),
+            ("gripper", self.gripper_dist["close"]["vial"]),
+            # Vertical extraction from the rack, blended straight into the retreat
+            ("movel_path", [({"z": 55}, 40), ("vial_stock_prep", 100)], 100),
+            ("movej", "safe_rack", 30),
+            ("movej", "home_prep_bal", 30),
+            ("movej", "safe_bal", 30),
+            ("movel_path", [("prep_viap_drop", 40), ("drop_vial", 20)], 100),
+            ("gripper", open_vial),
+            ("movel", "prep_viap_drop", 30),
+            ("movel", "safe_bal", 100),
+            ("movej", "home_prep_bal", 30),
+            ("movej", "safe_rack", 30),
+        ], use_script=use_script)
         self._gripper_item = None
-        self.movel("prep_viap_drop",vel=30)
-        self.movel("safe_bal")
-        self.movej("home_prep_bal")
-        self.movej("safe_rack")
 
 #Passed the test with tray update-2025/10/13. The position of dose head can be adjusted slightly. but it doesn't affect that much
-    def dose_2_balance(self,dose_loc:str):
+    def dose_2_balance(self,dose_loc:str, use_script: bool = False):
         if self._rob_loc !="safe_rack":
             raise ValueError("start position should be 'safe_rack'")
-        self.gripper_pos(self.gripper_dist["open"]["dose"])
-
-        self.movej("dos_rack_prep")
-        dose = self.dose_stock[dose_loc]
-        self.movel(dose.location, vel=80)
-        self.movel(x = 50, vel = 50)
-        self.gripper_pos(self.gripper_dist["close"]["dose"])
+        open_dose = self.gripper_dist["open"]["dose"]
+        dose_pose = self._dose_stock_pos[self._dose_idx[dose_loc]]
+        self.run_sequence([
+            ("gripper_async", open_dose),  # empty gripper: open while approaching the rack
+            ("movej", "dos_rack_prep", 30),
+            ("movel", dose_pose, 80),
+            ("movel", {"x": 50}, 50),
+            ("gripper", self.gripper_dist["close"]["dose"]),
+            # 3 mm lift clears the dose head seat, then one diagonal retract
+            ("movel_path", [{"z": 3}, {"x": -50, "z": 60}, ("dose_stock_back", 80)], 50),
+            ("movej", "out_bal_prep", 30),
+            ("movel", "dos_bal_in_prep", 80),
+            ("movel", "dos_head_up", 80),
+            ("movel", "dos_head_in", 80),
+            ("gripper", open_dose),
+            ("movel", "dos_bal_in_prep", 80),
+            ("movel", "out_bal_prep", 80),
+            ("movej", "safe_rack", 30),
+        ], use_script=use_script)
         self._gripper_item = "dose"
-        self.movel(z=3,vel=50)
-        self.movel(x=-50,vel=50)
-        self.movel(z=60,vel=50)
-        self.movel("dose_stock_back",vel=80)
-        self.movej("out_bal_prep")
-        self.movel("dos_bal_in_prep",vel=80)
-        self.movel("dos_head_up",vel=80)
-        self.movel("dos_head_in",vel=80)
-        self.gripper_pos(self
-                         .gripper_dist["open"]["dose"])
-        self.movel("dos_bal_in_prep",vel=80)
-        self.movel("out_bal_prep",vel=80)
-        self.movej("safe_rack")
         self._rob_loc = "safe_rack"
 
 
@@ -275,8 +511,7 @@ class URController:
         self.movej("safe_bal_2_ot")
         self.movej("safe_ot")
         self.movej("prep_drop_ot")
-        OT_vial = self.vial_sample[vial_loc]
-        self.movel(OT_vial.location, vel=50)
+        self.movel(self._vial_sample_pos[self._vial_sample_idx[vial_loc]], vel=50)
         self.movel(z = -50, vel=20)
         self.gripper_pos(self.gripper_dist["open"]["vial"])
         print("[Debug] Opening gripper...")
@@ -10,11 +10,53 @@ Author: Xiaoman Guo
 
 from rtde_control import RTDEControlInterface as rtc
 from rtde_receive import RTDEReceiveInterface as rtr
+import re
 import socket
+import threading
 import time
 import math
+import random
+from concurrent.futures import Future, ThreadPoolExecutor
 import numpy as np
-from scipy.spatial.transform import Rotation
+
+_DEG = 180.0 / math.pi  # rad -> deg factor
+_RAD = math.pi / 180.0  # deg -> rad factor
+
+# --- Orientation conversions (extrinsic xyz Euler degrees <-> rotation vector) ---
+# Closed-form via a unit quaternion; same convention as scipy's Rotation 'xyz', without
+# constructing Rotation objects for every single pose.
+def _euler_xyz_deg_to_rotvec(euler_deg):
+    half_x, half_y, half_z = (a * _RAD / 2 for a in euler_deg)
+    cx, sx = math.cos(half_x), math.sin(half_x)
+    cy, sy = math.cos(half_y), math.sin(half_y)
+    cz, sz = math.cos(half_z), math.sin(half_z)
+    # q = qz * qy * qx
+    w = cz * cy * cx + sz * sy * sx
+    x = cz * cy * sx - sz * sy * cx
+    y = cz * sy * cx + sz * cy * sx
+    z = sz * cy * cx - cz * sy * sx
+    if w < 0:  # keep the rotation angle in [0, pi]
+        w, x, y, z = -w, -x, -y, -z
+    angle = 2 * math.atan2(math.sqrt(x * x + y * y + z * z), w)
+    if angle < 1e-3:
+        scale = 2 + angle * angle / 12 + 7 * angle ** 4 / 2880  # Taylor series of angle / sin(angle / 2)
+    else:
+        scale = angle / math.sin(angle / 2)
+    return [scale * x, scale * y, scale * z]
+
+
+def _rotvec_to_euler_xyz_deg(rotvec):
+    rx, ry, rz = rotvec
+    angle = math.sqrt(rx * rx + ry * ry + rz * rz)
+    if angle < 1e-3:
+        scale = 0.5 - angle * angle / 48 + angle ** 4 / 3840  # Taylor series of sin(angle / 2) / angle
+    else:
+        scale = math.sin(angle / 2) / angle
+    w, x, y, z = math.cos(angle / 2), scale * rx, scale * ry, scale * rz
+    sin_y = max(-1.0, min(1.0, 2 * (w * y - z * x)))
+    return [math.atan2(2 * (w * x + y * z), 1 - 2 * (x * x + y * y)) * _DEG,
+            math.asin(sin_y) * _DEG,
+            math.atan2(2 * (w * z + x * y), 1 - 2 * (y * y + z * z)) * _DEG]
 
 # --- Main URArm wrapper ---
 class URArm:
@@ -24,10 +66,14 @@ class URArm:
     - All velocities in mm/s, gripper force/velocity in 0-1
     - Handles all conversions internally
     """
+    # Only the RTDE outputs this wrapper reads; subscribing to the full recipe wastes bandwidth
+    RTDE_RECEIVE_VARIABLES = ["actual_q", "actual_TCP_pose"]
+
     def __init__(self, robot_ip, gripper_ip=None, gripper_id=1, gripper_port=63352, gripper_connect=True,
                  default_velocity: float = 250, max_velocity: float = 500, default_joint_velocity: float = 20.0, max_joint_velocity = 180.0,
-                   gripper_default_velocity=0.5, gripper_default_force=0.5):
+                   gripper_default_velocity=0.5, gripper_default_force=0.5, rtde_frequency: float = 125.0):
         self.robot_ip = robot_ip
+        self._rtde_frequency = rtde_frequency
         self._default_velocity = default_velocity  # mm/s
         self._default_joint_velocity = default_joint_velocity
         self._gripper_default_velocity = gripper_default_velocity
@@ -39,76 +85,131 @@ class URArm:
     def _init_rtde(self):
         try:
             self.rtde_c = rtc(self.robot_ip,
-                              frequency=50,
+                              frequency=self._rtde_frequency,
                               )
             print("RTDEControl connected")
             self.rtde_r = rtr(self.robot_ip,
-                              frequency=10,
+                              frequency=self._rtde_frequency,
+                              variables=self.RTDE_RECEIVE_VARIABLES,
                               )
             print("RTDEReceive connected")
         except Exception as e:
             print(f"[URArm] RTDE connect failed: {e}, will retry on next command.")
             self.rtde_c = None
             self.rtde_r = None
-
-    def _reconnect_rtde(self):
-        print("[URArm] Attempting RTDE reconnect...")
-        self._init_rtde()
+        self._bind_rtde_methods()
+
+    def _bind_rtde_methods(self):
+        """Cache bound RTDE methods; must be repeated whenever the interfaces are recreated."""
+        self._moveJ = self.rtde_c.moveJ if self.rtde_c is not None else None
+        self._moveL = self.rtde_c.moveL if self.rtde_c is not None else None
+        self._getQ = self.rtde_r.getActualQ if self.rtde_r is not None else None
+        self._getTCP = self.rtde_r.getActualTCPPose if self.rtde_r is not None else None
+
+    def _rtde_connected(self) -> bool:
+        """Cheap liveness check of both RTDE interfaces."""
+        return (self.rtde_c is not None and self.rtde_r is not None
+                and self.rtde_c.isConnected() and self.rtde_r.isConnected())
+
+    def _reconnect_rtde(self, max_retries: int = 5, base_delay: float = 0.1, max_delay: float = 1.0) -> bool:
+        """
+        Re-create the RTDE interfaces with exponential backoff (plus jitter, capped at max_delay).
+        Returns False without touching the link if it is still up (the error was not a connection
+        problem), True once reconnected; raises ConnectionError if every attempt fails.
+        """
+        if self._rtde_connected():
+            return False
+        for attempt in range(max_retries):
+            print(f"[URArm] Attempting RTDE reconnect ({attempt + 1}/{max_retries})...")
+            self._init_rtde()
+            if self._rtde_connected():
+                return True
+            time.sleep(min(max_delay, base_delay * 2 ** attempt + random.uniform(0, 0.05)))
+        raise ConnectionError(f"[URArm] Could not reconnect RTDE to {self.robot_ip} after {max_retries} attempts")
 
     def get_joints(self):
         # try:
-        joints = self.rtde_r.getActualQ()
+        joints = self._getQ()
         # except Exception as e:
         #     print(f"[URArm] get_joints error: {e}, reconnecting...")
         #     self._reconnect_rtde()
         #     joints = self.rtde_r.getActualQ()
-        return [math.degrees(j) for j in joints]
+        return [j * _DEG for j in joints]
 
     def movej(self, joints, velocity: float = None, acceleration: float = None, async_move=False):
         vel = velocity if velocity is not None else self._default_velocity
         acc = acceleration if acceleration is not None else vel * 2
-        joints_rad = [math.radians(j) for j in joints]
-        vel_rad = math.radians(vel)
-        acc_rad = math.radians(acc)
+        joints_rad = np.deg2rad(joints).tolist()
+        vel_rad = vel * _RAD
+        acc_rad = acc * _RAD
         try:
-            self.rtde_c.moveJ(joints_rad, vel_rad, acc_rad, async_move)
+            self._moveJ(joints_rad, vel_rad, acc_rad, async_move)
         except Exception as e:
             print(f"[URArm] movej error: {e}, reconnecting...")
-            self._reconnect_rtde()
-            self.rtde_c.moveJ(joints_rad, vel_rad, acc_rad, async_move)
+            if not self._reconnect_rtde():
+                raise
+            self._moveJ(joints_rad, vel_rad, acc_rad, async_move)
+
+    def wait_until_steady(self, poll_interval: float = 0.005, timeout: float = 60.0):
+        """Block until the controller reports the arm is no longer moving."""
+        start_time = time.monotonic()
+        while not self.rtde_c.isSteady():
+            if time.monotonic() - start_time > timeout:
+                raise TimeoutError("Timeout while waiting for robot to become steady")
+            time.sleep(poll_interval)
+
+    @staticmethod
+    def _pose_to_m_rotvec(pose):
+        """Convert a mm/deg (Euler xyz) pose or Location to the m/rotvec pose used by RTDE."""
+        if isinstance(pose, Location):
+            pose = pose.as_mm_deg()
+        pose = np.asarray(pose, dtype=np.float64)
+        return (pose[:3] * 1e-3).tolist() + _euler_xyz_deg_to_rotvec(pose[3:].tolist())
 
     def movel(self, pose, velocity: float = None, acceleration: float = None, async_move=False):
-        if isinstance(pose, Location):
-            pos_mm = pose.as_mm_deg()
-        else:
-            pos_mm = pose
-        xyz_m = [p/1000 for p in pos_mm[:3]]
-        rot = Rotation.from_euler('xyz', pos_mm[3:], degrees=True)
-        rotvec = rot.as_rotvec()
-        pos_m_rad = list(xyz_m) + list(rotvec)
+        pos_m_rad = self._pose_to_m_rotvec(pose)
         vel = velocity if velocity is not None else self._default_velocity
         acc = acceleration if acceleration is not None else vel * 2
         vel_m = vel / 1000
         acc_m = acc / 1000
         try:
-            self.rtde_c.moveL(pos_m_rad, vel_m, acc_m, async_move)
+            self._moveL(pos_m_rad, vel_m, acc_m, async_move)
         except Exception as e:
             print(f"[URArm] movel error: {e}, reconnecting...")
-            self._reconnect_rtde()
-            self.rtde_c.moveL(pos_m_rad, vel_m, acc_m, async_move)
+            if not self._reconnect_rtde():
+                raise
+            self._moveL(pos_m_rad, vel_m, acc_m, async_move)
+
+    def movel_path(self, poses, velocities, acceleration: float = None, blends=None, async_move=False):
+        """
+        Move through several poses as one blended trajectory (RTDE moveL with a path).
+        - poses: mm/deg poses or Location objects
+        - velocities: mm/s per segment (the speed used to reach each pose)
+        - blends: blend radius in mm at each pose; the last one is forced to 0 so the arm stops there
+        """
+        if blends is None:
+            blends = [0.0] * len(poses)
+        path = []
+        for i, (pose, vel) in enumerate(zip(poses, velocities)):
+            acc = acceleration if acceleration is not None else vel * 2
+            blend = blends[i] if i < len(poses) - 1 else 0.0
+            path.append(self._pose_to_m_rotvec(pose) + [vel / 1000, acc / 1000, blend / 1000])
+        try:
+            self._moveL(path, async_move)
+        except Exception as e:
+            print(f"[URArm] movel_path error: {e}, reconnecting...")
+            if not self._reconnect_rtde():
+                raise
+            self._moveL(path, async_move)
 
     def get_tcp_pose(self, as_location: bool = False):
         # try:
-        pos = self.rtde_r.getActualTCPPose()
+        pos = self._getTCP()
         # except Exception as e:
         #     print(f"[URArm] get_tcp_pose error: {e}, reconnecting...")
         #     self._reconnect_rtde()
         #     pos = self.rtde_r.getActualTCPPose()
-        xyz_mm = [p*1000 for p in pos[:3]]
-        rotvec = np.array(pos[3:])
-        rot = Rotation.from_rotvec(rotvec)
-        euler_deg = rot.as_euler('xyz', degrees=True)
-        pose_mm_deg = list(xyz_mm) + list(euler_deg)
+        pose_mm_deg = (np.asarray(pos[:3], dtype=np.float64) * 1000).tolist() + _rotvec_to_euler_xyz_deg(pos[3:])
         if as_location:
             return Location(pose_mm_deg[:3], pose_mm_deg[3:])
         return pose_mm_deg
@@ -166,6 +267,9 @@ class Location:
     Stores position (mm) and orientation (deg, Euler xyz).
     Provides conversion to/from meters/radians and rotvec.
     """
+    # mm -> m for the position, deg -> rad for the orientation
+    _AS_M_RAD_SCALE = np.array([1e-3, 1e-3, 1e-3, math.pi / 180, math.pi / 180, math.pi / 180])
+
     def __init__(self, position, orientation):
         self.position = list(position)
         self.orientation = list(orientation)
@@ -178,7 +282,7 @@ class Location:
         return self.position + self.orientation
 
     def as_m_rad(self):
-        return [p/1000 for p in self.position] + [math.radians(a) for a in self.orientation]
+        return (np.asarray(self.position + self.orientation, dtype=np.float64) * Location._AS_M_RAD_SCALE).tolist()
 
     def __repr__(self):
         return f"Location(position={self.position}, orientation={self.orientation})"
@@ -198,12 +302,24 @@ class RobotiqGripper:
     STATUS_RESET = 0
     STATUS_ACTIVATING = 1
     STATUS_ACTIVE = 3
-
-    def __init__(self, host: str, base_port: int = 63352, id: int = 1, timeout: float = 2.0, connect: bool = True):
+    # OBJ register: 0 = moving, 1/2 = stopped on an object (opening/closing), 3 = at requested position
+    OBJ_MOVING = 0
+    _REGISTER_REPLY = re.compile(rb'([A-Z]{3}) (\d+)')
+    _RECV_SIZE = 64  # replies are 'ack' or '<REG> <value>', well under 20 bytes each
+
+    def __init__(self, host: str, base_port: int = 63352, id: int = 1, timeout: float = 2.0, connect: bool = True,
+                 socket_options=None):
+        """
+        socket_options: extra (level, option, value) tuples passed to setsockopt after connecting,
+        e.g. [(socket.SOL_SOCKET, socket.SO_RCVBUF, 4096)]
+        """
         self.host = host
         self.port = base_port + id - 1
         self.timeout = timeout
+        self.socket_options = list(socket_options or ())
         self.connection = None
+        self._lock = threading.Lock()  # one request/response exchange on the socket at a time
+        self._executor = None  # created on the first move_async()
         if connect:
             self.connect()
 
@@ -217,16 +333,54 @@ class RobotiqGripper:
         self.connection = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
         self.connection.connect((self.host, self.port))
         self.connection.settimeout(self.timeout)
+        # Register commands are tiny request/response pairs; don't let Nagle or delayed ACKs hold them back
+        self.connection.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
+        try:
+            self.connection.setsockopt(socket.IPPROTO_TCP, socket.TCP_QUICKACK, 1)
+        except (AttributeError, OSError):  # Linux only
+            pass
+        # Detect a half-open connection (e.g. after a controller fault) within a few seconds
+        self.connection.setsockopt(socket.SOL_SOCKET, socket.SO_KEEPALIVE, 1)
+        for name, value in (('TCP_KEEPIDLE', 2), ('TCP_KEEPINTVL', 1), ('TCP_KEEPCNT', 3)):
+            if hasattr(socket, name):  # Linux only
+                self.connection.setsockopt(socket.IPPROTO_TCP, getattr(socket, name), value)
+        for level, option, value in self.socket_options:
+            self.connection.setsockopt(level, option, value)
 
     def disconnect(self):
+        if self._executor is not None:
+            self._executor.shutdown(wait=True)
+            self._executor = None
         if self.connection:
             self.connection.close()
             self.connection = None
 
+    def _exchange(self, payload: bytes, receive):
+        """Send payload and return receive(); on a dropped or stalled connection, reconnect once and retry."""
+        # The socket is opened once and reused for every register command
+        with self._lock:
+            if self.connection is None:
+                self.connect()
+            try:
+                self.connection.sendall(payload)
+                return receive()
+            except (BrokenPipeError, ConnectionResetError, socket.timeout):
+                # Controller dropped the connection or stopped answering; a fresh socket also
+                # discards any late reply to the failed request
+                self.connection.close()
+                self.connection = None
+                self.connect()
+                self.connection.sendall(payload)
+                return receive()
+
+    def _recv_reply(self) -> bytes:
+        data = self.connection.recv(self._RECV_SIZE)
+        if not data:
+            raise ConnectionResetError('Gripper closed the connection')
+        return data
+
     def request(self, request: bytes) -> bytes:
-        self.connection.send(request + b'\n')
-        response = self.connection.recv(1024)
-        return response
+        return self._exchange(request + b'\n', self._recv_reply)
 
     def set_registers(self, registers):
         command = 'SET ' + ' '.join([f'{name} {val}' for name, val in registers.items()])
@@ -240,6 +394,40 @@ class RobotiqGripper:
             raise RobotiqGripperInvalidResponseError(f'Invalid response: {response}')
         return response[len(name) + 1:].strip()
 
+    def get_registers(self, names) -> dict:
+        """
+        Read several registers in one round trip: the GET commands are written back to back in a
+        single send and the replies are parsed together. Returns {name: int}.
+        """
+        request = b'\n'.join(f'GET {name}'.encode() for name in names)
+
+        def receive():
+            data = b''
+            values = {}
+            while len(values) < len(names):
+                data += self._recv_reply()  # replies may be split across reads
+                values = {name.decode(): int(value) for name, value in self._REGISTER_REPLY.findall(data)}
+            return values
+
+        values = self._exchange(request + b'\n', receive)
+        missing = set(names) - values.keys()
+        if missing:
+            raise RobotiqGripperInvalidResponseError(f'Missing registers in response: {sorted(missing)}')
+        return values
+
+    @property
+    def status(self) -> int:
+        return int(self.get_register('STA'))
+
+    def wait_for_activation(self, timeout: float = 5.0, poll_interval: float = 0.02):
+        """Poll the status register until activation completes instead of sleeping blindly."""
+        start_time = time.monotonic()
+        while time.monotonic() - start_time < timeout:
+            if self.status == self.STATUS_ACTIVE:
+                return
+            time.sleep(poll_interval)
+        raise RobotiqGripperTimeoutError('Timeout while waiting for gripper activation')
+
     @property
     def position_int(self) -> int:
         return int(self.get_register('POS'))
@@ -260,17 +448,31 @@ class RobotiqGripper:
         velocity_int = round(velocity * 255)
         self.set_registers({'POS': position_int, 'SPE': velocity_int, 'FOR': force_int, 'GTO': 1})
         if wait:
-            self.wait_for_stop(timeout)
-
-    def wait_for_stop(self, timeout: float = 10.0):
-        last_pos = self.position_int
-        start_time = time.time()
-        while time.time() - start_time < timeout:
-            time.sleep(0.1)
-            current_pos = self.position_int
-            if current_pos == last_pos:
+            self.wait_for_stop(timeout, requested_position=position_int)
+
+    def move_async(self, position: float, force: float = 0.5, velocity: float = 0.5, timeout: float = 10.0) -> Future:
+        """
+        Send the move command and return immediately; the returned Future resolves once the
+        fingers stop (or raises RobotiqGripperTimeoutError). Invalid arguments and a missing
+        ack are still raised here, before anything runs in the background.
+        """
+        self.move(position, force=force, velocity=velocity, wait=False)
+        if self._executor is None:
+            self._executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="robotiq")
+        return self._executor.submit(self.wait_for_stop, timeout, round(position * 255))
+
+    def wait_for_stop(self, timeout: float = 10.0, requested_position: int = None, poll_interval: float = 0.02):
+        """
+        Poll PRE/OBJ until the gripper has taken the requested position (PRE echoes it, so a stale
+        OBJ from the previous move is ignored) and OBJ reports it stopped.
+        """
+        start_time = time.monotonic()
+        while time.monotonic() - start_time < timeout:
+            registers = self.get_registers(('PRE', 'OBJ'))
+            if (requested_position is None or registers['PRE'] == requested_position) \
+                    and registers['OBJ'] != self.OBJ_MOVING:
                 return
-            last_pos = current_pos
+            time.sleep(poll_interval)
         raise RobotiqGripperTimeoutError(f'Timeout while waiting for gripper to stop')
   
    
\ No newline at end of file
@@ -3,7 +3,7 @@ SDL2 Utilities Package
 """
 
 from .error_handling import (
-    socket_timeout_retry, safe_execute, with_timeout,
+    socket_timeout_retry, safe_execute, with_timeout, with_poll_timeout,
     application_thread_exception_handler, configure_global_exception_handler, 
     register_monitoring_recovery_handler
 )
@@ -12,13 +12,13 @@ from .logger import (
     log_function_calls, log_with_function_name, log_entry_exit
 )
 from .component_manager import ComponentManager, component_manager, track_component_calls, register_for_cleanup, emergency_shutdown
-from .settings_loader import load_sdl2_settings, get_component_settings, get_setting
+from .settings_loader import load_sdl2_settings, get_component_settings, get_setting, get_settings_batch
 
 __all__ = [
-    'socket_timeout_retry', 'safe_execute', 'with_timeout',
+    'socket_timeout_retry', 'safe_execute', 'with_timeout', 'with_poll_timeout',
     'application_thread_exception_handler', 'configure_global_exception_handler', 'register_monitoring_recovery_handler',
     'logger', 'log_exception', 'log_and_catch_exception', 'file_log',
     'log_function_calls', 'log_with_function_name', 'log_entry_exit',
     'ComponentManager', 'component_manager', 'track_component_calls', 'register_for_cleanup', 'emergency_shutdown',
-    'load_sdl2_settings', 'get_component_settings', 'get_setting'
+    'load_sdl2_settings', 'get_component_settings', 'get_setting', 'get_settings_batch'
 ]
@@ -9,13 +9,153 @@ and maintains individual files for each component:
 """
 
 import json
+import os
 import atexit
+import logging
+import logging.handlers
+import queue
 import signal
 import sys
+import threading
+import time
+from collections import namedtuple
 from pathlib import Path
 from typing import Any, Dict, Type, Optional
 from datetime import datetime
-from .logger import logger
+from .logger import logger, formatter
+
+try:
+    import orjson
+except ImportError:  # fall back to the stdlib encoder
+    orjson = None
+
+# Per-call bookkeeping messages in the manager log (SDL2_DEBUG_MANAGER=1 turns them on)
+_DEBUG_MANAGER = os.environ.get("SDL2_DEBUG_MANAGER", "0") == "1"
+
+# Usage counters live in memory; dirty files are written at most this often (and on cleanup)
+_USAGE_FLUSH_INTERVAL = 2.0  # seconds
+
+
+def _dumps(data: Dict) -> bytes:
+    """Serialize usage data to indented JSON bytes."""
+    if orjson is not None:
+        return orjson.dumps(data, option=orjson.OPT_INDENT_2)
+    return json.dumps(data, indent=2).encode('utf-8')
+
+
+# Class and settings key recorded by reg_comp for create_component
+_RegistryEntry = namedtuple('_RegistryEntry', ('cls', 'settings_key'))
+
+# Methods tried, in order, to shut a component down
+CLEANUP_METHODS = ('disconnect', 'close', 'stop', 'cleanup', 'shutdown')
+_NOT_CACHED = object()
+
+# Last formatted timestamp and the monotonic time it was taken at
+_ts_cache = [float('-inf'), ""]
+
+
+def _now_iso() -> str:
+    """Current time as ISO 8601, reused for calls within the same millisecond."""
+    t = time.monotonic()
+    if t - _ts_cache[0] > 0.001:
+        _ts_cache[0] = t
+        _ts_cache[1] = datetime.now().isoformat()
+    return _ts_cache[1]
+
+
+class _BufferedRotatingFileHandler(logging.handlers.RotatingFileHandler):
+    """
+    RotatingFileHandler that buffers writes instead of flushing after every record.
+    
+    The log router flushes it once the queue runs dry; during a long burst it also
+    flushes every FLUSH_BYTES. The rollover size check only asks the file for its
+    position every STAT_BYTES written instead of on every record.
+    """
+    BUFFER_SIZE = 1024 * 1024
+    FLUSH_BYTES = 256 * 1024
+    STAT_BYTES = 64 * 1024
+    
+    def __init__(self, *args, **kwargs):
+        self._pending = 0                   # bytes written since the last flush
+        self._unchecked = self.STAT_BYTES   # bytes since the last rollover check (check on first record)
+        super().__init__(*args, **kwargs)
+    
+    def _open(self):
+        return open(self.baseFilename, self.mode, buffering=self.BUFFER_SIZE,
+                    encoding=self.encoding, errors=self.errors)
+    
+    def shouldRollover(self, record):
+        if self.maxBytes <= 0 or self._unchecked < self.STAT_BYTES:
+            return False
+        self._unchecked = 0
+        if self.stream is None:
+            self.stream = self._open()
+        self.stream.seek(0, 2)
+        # Leave room for the bytes that will be written before the next check
+        return self.stream.tell() + self.STAT_BYTES >= self.maxBytes
+    
+    def doRollover(self):
+        super().doRollover()
+        self._pending = 0
+        self._unchecked = 0
+    
+    def emit(self, record):
+        try:
+            if self.shouldRollover(record):
+                self.doRollover()
+            if self.stream is None:
+                self.stream = self._open()
+            msg = self.format(record) + self.terminator
+            self.stream.write(msg)
+            self._pending += len(msg)
+            self._unchecked += len(msg)
+            if self._pending >= self.FLUSH_BYTES:
+                self.flush()
+        except RecursionError:
+            raise
+        except Exception:
+            self.handleError(record)
+    
+    def flush(self):
+        super().flush()
+        self._pending = 0
+
+
+class _RoutingHandler(logging.Handler):
+    """
+    Hands each queued record to the handlers registered for its logger name,
+    flushing them whenever the queue has been drained.
+    """
+    
+    def __init__(self, log_queue: queue.Queue):
+        super().__init__()
+        self.routes: Dict[str, list] = {}
+        self._queue = log_queue
+        self._unflushed: set = set()
+    
+    def add_route(self, logger_name: str, *handlers: logging.Handler):
+        self.routes.setdefault(logger_name, []).extend(handlers)
+    
+    def handle(self, record):
+        for handler in self.routes.get(record.name, ()):
+            if record.levelno >= handler.level:
+                handler.handle(record)
+                self._unflushed.add(handler)
+        if self._queue.empty():
+            self.flush()
+        return True
+    
+    def flush(self):
+        for handler in self._unflushed:
+            handler.flush()
+        self._unflushed.clear()
+
+
+class _BlockingQueueHandler(logging.handlers.QueueHandler):
+    """QueueHandler that waits for room in a full queue instead of dropping the record."""
+    
+    def enqueue(self, record):
+        self.queue.put(record)
 
 
 def track_component_calls(component_name: str):
@@ -29,17 +169,25 @@ def track_component_calls(component_name: str):
             # function implementation
     """
     def decorator(func):
+        comp_logger = None  # resolved on the first call made after the component is registered
+        
         def wrapper(self, *args, **kwargs):
-            # Track the function call
-            component_manager.track_function_call(component_name, func.__name__, args, kwargs)
+            nonlocal comp_logger
+            cm = component_manager
+            
+            # Track the function call (one event per call; failures add an error event below)
+            if cm._tracking_enabled:
+                if comp_logger is None and component_name in cm.registered_components:
+                    comp_logger = cm.component_loggers[component_name]
+                if comp_logger is not None:
+                    cm.track_function_call(component_name, func.__name__, args, kwargs, _comp_logger=comp_logger)
             
             # Call the original function
             try:
-                result = func(self, *args, **kwargs)
-                component_manager.log_component_usage(component_name, "function_success", f"{func.__name__} completed successfully")
-                return result
+                return func(self, *args, **kwargs)
             except Exception as e:
-                component_manager.log_component_error(component_name, f"{func.__name__} failed: {str(e)}")
+                if component_name in cm.registered_components:
+                    cm.log_component_error(component_name, f"{func.__name__} failed: {str(e)}")
                 raise
         return wrapper
     return decorator
@@ -55,29 +203,86 @@ class ComponentManager:
     - Individual JSON files per component
     - Debug-level logging for component activities
     - Simple reset functionality
+    
+    Set SDL2_TRACK_CALLS=0 to turn off @track_component_calls bookkeeping.
     """
     
-    def __init__(self, data_dir: Path = None):
+    _tracking_enabled = os.environ.get("SDL2_TRACK_CALLS", "1") != "0"
+    
+    def __init__(self, data_dir: Path = None, install_signal_handlers: bool = False, install_atexit: bool = False):
+        """
+        Args:
+            data_dir: Directory for usage JSON and history log files
+            install_signal_handlers: Install the Ctrl+C cleanup handler now
+            install_atexit: Register cleanup_all to run at interpreter exit now
+        
+        Both hooks are otherwise installed by install_handlers() when the first
+        component is registered or created, so importing this module leaves
+        existing SIGINT handling alone.
+        """
         self.data_dir = data_dir or Path(__file__).resolve().parents[2] / "data" / "sdl2_components"
         self.data_dir.mkdir(parents=True, exist_ok=True)
         
         self.registered_components: Dict[str, Any] = {}
         self.component_loggers: Dict[str, Any] = {}
-        self._component_registry: Dict[str, Type] = {}
+        self._component_registry: Dict[str, _RegistryEntry] = {}
         self._is_shutting_down = False
         
+        # In-memory usage stats per component, flushed to the JSON files by _flush_usage
+        self._usage_cache: Dict[str, Dict] = {}
+        self._dirty: set = set()
+        # Guards the cache, the dirty set and the file writes across threads; reentrant because
+        # _record_usage flushes while holding it and the Ctrl+C cleanup can run on the same thread
+        self._usage_lock = threading.RLock()
+        self._last_flush = time.monotonic()
+        self._usage_paths: Dict[str, Path] = {}
+        # Usage files known to exist, so registration can skip the exists() stat
+        with os.scandir(self.data_dir) as entries:
+            self._known_files = {entry.name for entry in entries if entry.name.endswith('.json')}
+        self._cleanup_method_cache: Dict[type, Optional[str]] = {}
+        
+        # Component and manager log files are written by one listener thread; loggers only enqueue
+        self._log_queue = queue.Queue(maxsize=20000)
+        self._log_router = _RoutingHandler(self._log_queue)
+        self._log_listener = logging.handlers.QueueListener(self._log_queue, self._log_router)
+        self._log_listener.start()
+        self._log_listener_running = True
+        
         # Create ComponentManager's own debug logger
         self.manager_logger = self._create_manager_logger()
         
-        # Register cleanup on exit
-        atexit.register(self.cleanup_all)
-        
-        # Register signal handlers for Ctrl+C
-        self._setup_signal_handlers()
+        # Drain the log queue on exit; atexit runs in reverse order, so a later cleanup_all runs first
+        atexit.register(self._drain_logs)
+        self._atexit_installed = False
+        self._signal_handlers_installed = False
+        self.install_handlers(signal_handlers=install_signal_handlers, atexit_cleanup=install_atexit)
         
         logger.info("ComponentManager initialized")
         self.manager_logger.debug("ComponentManager initialized with data directory: %s", self.data_dir)
     
+    def _drain_logs(self):
+        """Write out queued log records and stop the listener thread."""
+        if self._log_listener_running:
+            self._log_listener_running = False
+            self._log_listener.stop()
+            self._log_router.flush()
+    
+    def install_handlers(self, signal_handlers: bool = True, atexit_cleanup: bool = True):
+        """
+        Install the exit-time cleanup hooks (each is installed at most once).
+        
+        Args:
+            signal_handlers: Clean up components and exit on Ctrl+C (main thread only)
+            atexit_cleanup: Run cleanup_all at interpreter exit
+        """
+        if atexit_cleanup and not self._atexit_installed:
+            atexit.register(self.cleanup_all)
+            self._atexit_installed = True
+        if (signal_handlers and not self._signal_handlers_installed
+                and threading.current_thread() is threading.main_thread()):
+            self._setup_signal_handlers()
+            self._signal_handlers_installed = True
+    
     def _setup_signal_handlers(self):
         """Setup signal handlers for graceful shutdown on Ctrl+C."""
         def signal_handler(signum, frame):
@@ -88,84 +293,62 @@ class ComponentManager:
         
         signal.signal(signal.SIGINT, signal_handler)   # Ctrl+C
     
-    def _create_manager_logger(self):
-        """Create ComponentManager's own debug logger with log rotation."""
-        import logging
-        from logging.handlers import RotatingFileHandler
-        from .logger import formatter
+    def _make_rotating_logger(self, logger_name: str, file_name: str, max_bytes: int, backups: int,
+                              add_console: bool) -> logging.Logger:
+        """
+        Get a DEBUG logger whose records go through the log queue to a rotating file.
         
-        # Create logger for ComponentManager using component naming convention
-        manager_logger = logging.getLogger("component.ComponentManager")
-        manager_logger.setLevel(logging.DEBUG)
+        Args:
+            logger_name: Logger name
+            file_name: Log file name inside the data directory
+            max_bytes: Size at which the log file is rotated
+            backups: Number of rotated files to keep
+            add_console: Also echo records to the console
+        """
+        new_logger = logging.getLogger(logger_name)
+        new_logger.setLevel(logging.DEBUG)
         
         # Avoid duplicate handlers
-        if manager_logger.handlers:
-            return manager_logger
-        
-        # Create rotating file handler for ComponentManager logs
-        # Max 5MB per file, keep 3 backup files (15MB total for ComponentManager)
-        log_file = self.data_dir / "componentmanager_history.log"
-        file_handler = RotatingFileHandler(
-            log_file, 
-            maxBytes=5*1024*1024,   # 5MB
-            backupCount=3,          # Keep 3 backup files
+        if new_logger.handlers:
+            return new_logger
+        
+        file_handler = _BufferedRotatingFileHandler(
+            self.data_dir / file_name,
+            maxBytes=max_bytes,
+            backupCount=backups,
             encoding='utf-8'
         )
-        file_handler.setLevel(logging.DEBUG)
+        handlers = [file_handler]
+        if add_console:
+            handlers.append(logging.StreamHandler())
         
         # Use the same formatter from the existing logger infrastructure
-        file_handler.setFormatter(formatter)
+        for handler in handlers:
+            handler.setLevel(logging.DEBUG)
+            handler.setFormatter(formatter)
         
-        # Add handler to logger (file only, no console spam for internal debug)
-        manager_logger.addHandler(file_handler)
+        # Route through the log queue; the handlers run on the listener thread
+        new_logger.addHandler(_BlockingQueueHandler(self._log_queue))
+        self._log_router.add_route(logger_name, *handlers)
         
-        # Prevent propagation to root logger to avoid console output without timestamps
-        manager_logger.propagate = False
+        # Prevent propagation to avoid double logging or console output without timestamps
+        new_logger.propagate = False
         
-        return manager_logger
+        return new_logger
+    
+    def _create_manager_logger(self):
+        """Create ComponentManager's own debug logger (file only; max 5MB, 3 backups)."""
+        return self._make_rotating_logger("component.ComponentManager", "componentmanager_history.log",
+                                          max_bytes=5*1024*1024, backups=3, add_console=False)
     
     def _create_component_logger(self, component_name: str):
-        """Create a logger for a specific component with log rotation."""
-        import logging
-        from logging.handlers import RotatingFileHandler
-        from .logger import formatter
-        
-        # Create logger
-        comp_logger = logging.getLogger(f"component.{component_name}")
-        comp_logger.setLevel(logging.DEBUG)
-        
-        # Avoid duplicate handlers
-        if comp_logger.handlers:
-            return comp_logger
-        
-        # Create rotating file handler for this component
-        # Max 20MB per file, keep 5 backup files (100MB total per component)
-        log_file = self.data_dir / f"{component_name.lower()}_history.log"
-        file_handler = RotatingFileHandler(
-            log_file, 
-            maxBytes=20*1024*1024,  # 20MB
-            backupCount=5,          # Keep 5 backup files
-            encoding='utf-8'
-        )
-        file_handler.setLevel(logging.DEBUG)
-        
-        # Create console handler for this component  
-        console_handler = logging.StreamHandler()
-        console_handler.setLevel(logging.DEBUG)
-        
-        # Use the same formatter from existing logger infrastructure
-        file_handler.setFormatter(formatter)
-        console_handler.setFormatter(formatter)
-        
-        # Add both handlers to logger
-        comp_logger.addHandler(file_handler)
-        comp_logger.addHandler(console_handler)
-        
-        # Prevent propagation to avoid double logging or interference with root logger
-        comp_logger.propagate = False
-        
+        """Create a logger for a specific component (file and console; max 20MB, 5 backups)."""
+        existing = self.component_loggers.get(component_name)
+        if existing is not None:
+            return existing
+        comp_logger = self._make_rotating_logger(f"component.{component_name}", f"{component_name.lower()}_history.log",
+                                                 max_bytes=20*1024*1024, backups=5, add_console=True)
         self.manager_logger.debug("Created rotating file logger for %s (max 20MB, 5 backups)", component_name)
-        
         return comp_logger
     
     def reg_all_comps(self, *components):
@@ -177,6 +360,8 @@ class ComponentManager:
         """
         self.manager_logger.debug("Starting registration of %d components", len([c for c in components if c is not None]))
         
+        self.install_handlers()
+        
         for component in components:
             if component is None:
                 continue
@@ -190,20 +375,24 @@ class ComponentManager:
             
             # Register component
             self.registered_components[component_name] = component
-            self.manager_logger.debug("Registered component instance: %s", component_name)
+            if _DEBUG_MANAGER:
+                self.manager_logger.debug("Registered component instance: %s", component_name)
             
             # Create individual logger for this component with file handler
             self.component_loggers[component_name] = self._create_component_logger(component_name)
-            self.manager_logger.debug("Created dedicated logger for component: %s", component_name)
+            if _DEBUG_MANAGER:
+                self.manager_logger.debug("Created dedicated logger for component: %s", component_name)
             
             # Assign the component logger to the instance for disconnect methods
             if hasattr(component, '_comp_logger') or hasattr(component, '__dict__'):
                 component._comp_logger = self.component_loggers[component_name]
-                self.manager_logger.debug("Assigned component logger to %s instance", component_name)
+                if _DEBUG_MANAGER:
+                    self.manager_logger.debug("Assigned component logger to %s instance", component_name)
             
             # Initialize component data file
             self._initialize_component_data(component_name)
-            self.manager_logger.debug("Initialized data file for component: %s", component_name)
+            if _DEBUG_MANAGER:
+                self.manager_logger.debug("Initialized data file for component: %s", component_name)
             
             # Log registration and track initialization
             self.log_component_usage(component_name, "initialized", "Component registered for monitoring")
@@ -211,41 +400,97 @@ class ComponentManager:
     
     def _initialize_component_data(self, component_name: str):
         """Initialize JSON data file for a component."""
-        data_file = self.data_dir / f"{component_name.lower()}_usage.json"
-        
-        if not data_file.exists():
-            initial_data = {
-                "component_name": component_name,
-                "usage_count": 0,
-                "last_used": None,
-                "created_at": datetime.now().isoformat()
-            }
-            
-            with open(data_file, 'w') as f:
-                json.dump(initial_data, f, indent=2)
-            
+        data_file = self._usage_path(component_name)
+        
+        if not self._usage_file_known(data_file):
+            self._write_initial_usage(component_name)
             self.component_loggers[component_name].debug(f"Initialized data file: {data_file}")
+        else:
+            self._usage_data(component_name)
+    
+    def _write_initial_usage(self, component_name: str):
+        """Create a component's usage file with zeroed stats and cache them."""
+        initial_data = {
+            "component_name": component_name,
+            "usage_count": 0,
+            "last_used": None,
+            "created_at": _now_iso()
+        }
+        with self._usage_lock:
+            self._save_component_data(component_name, initial_data)
+            self._known_files.add(self._usage_path(component_name).name)
+            self._usage_cache[component_name] = initial_data
+    
+    def _usage_file_known(self, data_file: Path) -> bool:
+        """Check whether a usage file exists, remembering positive results to skip later stats."""
+        if data_file.name in self._known_files:
+            return True
+        if data_file.exists():
+            self._known_files.add(data_file.name)
+            return True
+        return False
+    
+    def _usage_path(self, component_name: str) -> Path:
+        """Return the usage JSON path for a component (built once per name)."""
+        path = self._usage_paths.get(component_name)
+        if path is None:
+            path = self._usage_paths[component_name] = self.data_dir / f"{component_name.lower()}_usage.json"
+        return path
+    
+    def _usage_data(self, component_name: str) -> Dict:
+        """Return the cached usage stats for a component, loading its JSON file on first use."""
+        data = self._usage_cache.get(component_name)
+        if data is None:
+            with self._usage_lock:
+                data = self._usage_cache.get(component_name)
+                if data is None:
+                    data = self._usage_cache[component_name] = self._load_component_data(component_name)
+        return data
+    
+    def _flush_usage(self, force: bool = False):
+        """
+        Write changed usage stats to disk.
+        
+        Args:
+            force: Write now instead of waiting for the flush interval to elapse
+        """
+        if not self._dirty:
+            return
+        with self._usage_lock:
+            now = time.monotonic()
+            if not force and now - self._last_flush < _USAGE_FLUSH_INTERVAL:
+                return
+            self._last_flush = now
+            dirty, self._dirty = self._dirty, set()
+            for component_name in dirty:
+                self._save_component_data(component_name, self._usage_cache[component_name])
     
     def _load_component_data(self, component_name: str) -> Dict:
         """Load component data from JSON file."""
-        data_file = self.data_dir / f"{component_name.lower()}_usage.json"
+        data_file = self._usage_path(component_name)
         
         try:
-            with open(data_file, 'r') as f:
-                return json.load(f)
+            with open(data_file, 'rb') as f:
+                return orjson.loads(f.read()) if orjson is not None else json.load(f)
         except Exception as e:
             self.component_loggers[component_name].error(f"Failed to load data: {e}")
             return {}
     
     def _save_component_data(self, component_name: str, data: Dict):
-        """Save component data to JSON file."""
-        data_file = self.data_dir / f"{component_name.lower()}_usage.json"
+        """Save component data to JSON file (written to a temp file, then swapped in atomically)."""
+        data_file = self._usage_path(component_name)
+        tmp_file = data_file.with_suffix('.json.tmp')
         
         try:
-            with open(data_file, 'w') as f:
-                json.dump(data, f, indent=2)
+            data_bytes = _dumps(data)
+            fd = os.open(tmp_file, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o644)
+            try:
+                os.write(fd, data_bytes)
+            finally:
+                os.close(fd)
+            os.replace(tmp_file, data_file)
         except Exception as e:
-            self.component_loggers[component_name].error(f"Failed to save data: {e}")
+            self.component_loggers.get(component_name, self.manager_logger).error(f"Failed to save data: {e}")
     
     def log_component_usage(self, component_name: str, action: str, details: str = ""):
         """
@@ -256,26 +501,18 @@ class ComponentManager:
             action: Action being performed (e.g., "initialized", "used", "error")
             details: Additional details about the action
         """
-        self.manager_logger.debug("Logging usage for component: %s, action: %s", component_name, action)
+        if _DEBUG_MANAGER:
+            self.manager_logger.debug("Logging usage for component: %s, action: %s", component_name, action)
         
         if component_name not in self.registered_components:
             logger.warning(f"Component {component_name} not registered")
-            self.manager_logger.debug("Attempted to log usage for unregistered component: %s", component_name)
+            if _DEBUG_MANAGER:
+                self.manager_logger.debug("Attempted to log usage for unregistered component: %s", component_name)
             return
         
-        # Load current data
-        data = self._load_component_data(component_name)
-        
-        # Update usage count
-        if action == "used":
-            data["usage_count"] += 1
-        
-        # Update last used timestamp
-        data["last_used"] = datetime.now().isoformat()
-        
-        # Save data
-        self._save_component_data(component_name, data)
-        self.manager_logger.debug("Updated usage data for %s: count=%d, action=%s", component_name, data["usage_count"], action)
+        data = self._record_usage(component_name, action)
+        if _DEBUG_MANAGER:
+            self.manager_logger.debug("Updated usage data for %s: count=%d, action=%s", component_name, data.get("usage_count", 0), action)
         
         # Log to component logger
         log_message = f"Action: {action}"
@@ -284,6 +521,22 @@ class ComponentManager:
         
         self.component_loggers[component_name].debug(log_message)
     
+    def _record_usage(self, component_name: str, action: str) -> Dict:
+        """Update the cached stats for an action; the file is rewritten by the periodic flush."""
+        data = self._usage_data(component_name)
+        
+        with self._usage_lock:
+            # Update usage count
+            if action == "used":
+                data["usage_count"] = data.get("usage_count", 0) + 1
+            
+            # Update last used timestamp
+            data["last_used"] = _now_iso()
+            
+            self._dirty.add(component_name)
+            self._flush_usage()
+        return data
+    
     def reset_component_usage(self, component_name: str):
         """
         Reset component usage counter to zero.
@@ -295,11 +548,13 @@ class ComponentManager:
             logger.warning(f"Component {component_name} not registered")
             return
         
-        data = self._load_component_data(component_name)
-        data["usage_count"] = 0
-        data["reset_at"] = datetime.now().isoformat()
-        
-        self._save_component_data(component_name, data)
+        data = self._usage_data(component_name)
+        with self._usage_lock:
+            data["usage_count"] = 0
+            data["reset_at"] = _now_iso()
+            
+            self._dirty.add(component_name)
+            self._flush_usage(force=True)
         
         self.component_loggers[component_name].debug("Usage counter reset to zero")
         logger.info(f"Reset usage counter for {component_name}")
@@ -309,8 +564,7 @@ class ComponentManager:
         if component_name not in self.registered_components:
             return 0
         
-        data = self._load_component_data(component_name)
-        return data.get("usage_count", 0)
+        return self._usage_data(component_name).get("usage_count", 0)
 
     def log_component_error(self, component_name: str, error_message: str):
         """Log an error for a component."""
@@ -322,7 +576,8 @@ class ComponentManager:
         self.log_component_usage(component_name, "info", message)
         self.component_loggers[component_name].info(message)
     
-    def track_function_call(self, component_name: str, function_name: str, args: tuple = (), kwargs: dict = None):
+    def track_function_call(self, component_name: str, function_name: str, args: tuple = (), kwargs: dict = None,
+                            _comp_logger=None):
         """
         Track a function call on a component.
         
@@ -331,18 +586,22 @@ class ComponentManager:
             function_name: Name of the function being called
             args: Function arguments
             kwargs: Function keyword arguments
+            _comp_logger: The registered component's logger, when the caller has already
+                          resolved it (skips the registration lookup)
         """
-        if component_name not in self.registered_components:
-            return
+        comp_logger = _comp_logger
+        if comp_logger is None:
+            if component_name not in self.registered_components:
+                return
+            comp_logger = self.component_loggers.get(component_name)
         
-        kwargs = kwargs or {}
-        details = f"Function call: {function_name}"
-        if args:
-            details += f" with args: {args}"
-        if kwargs:
-            details += f" with kwargs: {kwargs}"
+        self._record_usage(component_name, "function_call")
         
-        self.log_component_usage(component_name, "function_call", details)
+        # Arguments are only formatted if the record is actually emitted
+        if comp_logger is None or not comp_logger.isEnabledFor(logging.DEBUG):
+            return
+        comp_logger.debug("Action: function_call - Function call: %s args=%s kwargs=%s",
+                          function_name, args, kwargs or {})
     
     def reg_comp(self, comp_name: str, comp_class: Type, settings_key: str = None):
         """
@@ -354,28 +613,21 @@ class ComponentManager:
             settings_key: Key in YAML settings file (defaults to comp_name.lower())
         """
         settings_key_used = settings_key or comp_name.lower()
-        self.manager_logger.debug("Registering component class: %s -> %s (settings_key: %s)", comp_name, comp_class.__name__, settings_key_used)
+        if _DEBUG_MANAGER:
+            self.manager_logger.debug("Registering component class: %s -> %s (settings_key: %s)", comp_name, comp_class.__name__, settings_key_used)
         
-        self._component_registry[comp_name] = {
-            "class": comp_class,
-            "settings_key": settings_key_used
-        }
+        self._component_registry[comp_name] = _RegistryEntry(comp_class, settings_key_used)
         
         # Initialize component data file for tracking only
-        data_file = self.data_dir / f"{comp_name.lower()}_usage.json"
-        if not data_file.exists():
-            initial_data = {
-                "component_name": comp_name,
-                "usage_count": 0,
-                "last_used": None,
-                "created_at": datetime.now().isoformat()
-            }
-            with open(data_file, 'w') as f:
-                json.dump(initial_data, f, indent=2)
-            self.manager_logger.debug("Created initial data file for component: %s", comp_name)
+        data_file = self._usage_path(comp_name)
+        if not self._usage_file_known(data_file):
+            self._write_initial_usage(comp_name)
+            if _DEBUG_MANAGER:
+                self.manager_logger.debug("Created initial data file for component: %s", comp_name)
         
         logger.info(f"Registered component class: {comp_name} -> {comp_class.__name__}")
-        self.manager_logger.debug("Component class registration completed: %s", comp_name)
+        if _DEBUG_MANAGER:
+            self.manager_logger.debug("Component class registration completed: %s", comp_name)
     
     def create_component(self, component_name: str, settings_file: Path = None, **override_kwargs) -> Any:
         """
@@ -392,12 +644,12 @@ class ComponentManager:
         if component_name not in self._component_registry:
             raise ValueError(f"Component class '{component_name}' not registered. Use register_component_class() first.")
         
+        self.install_handlers()
+        
         # Load settings from YAML
         from .settings_loader import get_component_settings
         
-        registry_entry = self._component_registry[component_name]
-        component_class = registry_entry["class"]
-        settings_key = registry_entry["settings_key"]
+        component_class, settings_key = self._component_registry[component_name]
         
         # Load settings from YAML file
         settings = get_component_settings(settings_key, settings_file)
@@ -481,17 +733,17 @@ class ComponentManager:
         comp_logger = self.component_loggers[component_name]
         
         try:
-            # Try common cleanup methods
-            cleanup_methods = ['disconnect', 'close', 'stop', 'cleanup', 'shutdown']
+            # Try common cleanup methods (resolved once per component class)
+            cls = type(component)
+            method_name = self._cleanup_method_cache.get(cls, _NOT_CACHED)
+            if method_name is _NOT_CACHED:
+                method_name = next((m for m in CLEANUP_METHODS if callable(getattr(cls, m, None))), None)
+                self._cleanup_method_cache[cls] = method_name
             
-            for method_name in cleanup_methods:
-                if hasattr(component, method_name):
-                    method = getattr(component, method_name)
-                    if callable(method):
-                        comp_logger.debug(f"Calling {method_name}() on {component_name}")
-                        method()
-                        self.log_component_usage(component_name, "cleanup", f"Successfully called {method_name}()")
-                        break
+            if method_name is not None:
+                comp_logger.debug(f"Calling {method_name}() on {component_name}")
+                getattr(component, method_name)()
+                self.log_component_usage(component_name, "cleanup", f"Successfully called {method_name}()")
             else:
                 comp_logger.debug(f"No standard cleanup method found for {component_name}")
                 self.log_component_usage(component_name, "cleanup", "No cleanup method found")
@@ -525,6 +777,7 @@ class ComponentManager:
             logger.error(f"Error during cleanup: {e}")
             self.manager_logger.debug("Error during cleanup process: %s", str(e))
         finally:
+            self._flush_usage(force=True)
             self._is_shutting_down = False
     
     def cleanup_old_logs(self, days_to_keep: int = 30):
@@ -534,32 +787,24 @@ class ComponentManager:
         Args:
             days_to_keep: Number of days of logs to keep (default: 30)
         """
-        import glob
-        import time
-        from pathlib import Path
-        
         cutoff_time = time.time() - (days_to_keep * 24 * 60 * 60)
         cleaned_count = 0
         
         self.manager_logger.debug("Starting cleanup of log files older than %d days", days_to_keep)
         
-        # Clean up all log files and backups in data directory
-        log_patterns = [
-            "*.log",
-            "*.log.*"  # Backup files like component_history.log.1
-        ]
-        
-        for pattern in log_patterns:
-            log_files = glob.glob(str(self.data_dir / pattern))
-            for log_file in log_files:
+        # Clean up all log files and backups (like component_history.log.1) in one directory pass
+        with os.scandir(self.data_dir) as entries:
+            for entry in entries:
+                name = entry.name
+                if not (name.endswith('.log') or '.log.' in name) or not entry.is_file():
+                    continue
                 try:
-                    file_path = Path(log_file)
-                    if file_path.stat().st_mtime < cutoff_time:
-                        file_path.unlink()
+                    if entry.stat().st_mtime < cutoff_time:
+                        os.unlink(entry.path)
                         cleaned_count += 1
-                        self.manager_logger.debug("Removed old log file: %s", file_path.name)
+                        self.manager_logger.debug("Removed old log file: %s", name)
                 except Exception as e:
-                    self.manager_logger.debug("Could not remove log file %s: %s", log_file, str(e))
+                    self.manager_logger.debug("Could not remove log file %s: %s", entry.path, str(e))
         
         if cleaned_count > 0:
             logger.info(f"Cleaned up {cleaned_count} old log files (older than {days_to_keep} days)")
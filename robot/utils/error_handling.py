@@ -4,10 +4,13 @@ Unified Error Handling and Retry Utilities for SDL2
 Combines exception handling, retry decorators, and error recovery in one module.
 """
 import asyncio
+import logging
+import random
 import socket
 import threading
 import time
 import traceback
+from concurrent.futures import Future, TimeoutError as FuturesTimeoutError
 from functools import wraps
 from typing import Optional, List, Callable, Type, Union
 from .logger import logger
@@ -20,6 +23,13 @@ from .component_manager import component_manager
 # Global registry for monitoring recovery handlers
 _monitoring_recovery_handlers = []
 
+# Exception type names / message marker that count as a timeout
+_TIMEOUT_TYPES = frozenset(("timeout", "socket.timeout", "TimeoutError"))
+_TIMEOUT_MARKER = "timed out"
+
+# Exceptions socket_timeout_retry treats as a retryable timeout
+_SOCKET_TIMEOUT_ERRORS = (socket.timeout, asyncio.TimeoutError, TimeoutError)
+
 
 def register_monitoring_recovery_handler(handler):
     """Register a monitoring recovery handler for automatic exception handling.
@@ -52,8 +62,12 @@ def application_thread_exception_handler(args):
     recovery_attempted = False
     global _monitoring_recovery_handlers
     
+    # Lowercased once for the checks below and in _analyze_device_error
+    exc_value_lower = exc_value.lower()
+    tb_lower = str(args.exc_traceback).lower() if args.exc_traceback else ""
+    
     # Only attempt recovery for timeout-related issues
-    if exc_type in ["timeout", "socket.timeout", "TimeoutError"] or "timed out" in exc_value.lower():
+    if exc_type in _TIMEOUT_TYPES or _TIMEOUT_MARKER in exc_value_lower:
         for recovery_handler in _monitoring_recovery_handlers:
             try:
                 if recovery_handler.handle_monitoring_thread_exception(args):
@@ -64,39 +78,39 @@ def application_thread_exception_handler(args):
                 logger.error(f"Error in recovery handler {type(recovery_handler).__name__}: {recovery_error}")
     
     # Device-specific error analysis
-    _analyze_device_error(thread_name, exc_type, exc_value, args.exc_traceback, recovery_attempted)
+    _analyze_device_error(thread_name, exc_type, exc_value_lower, tb_lower, recovery_attempted)
     
     logger.warning("TROUBLESHOOTING: Check connections, controller status, hardware availability")
     logger.error("="*60)
 
 
-def _analyze_device_error(thread_name: str, exc_type: str, exc_value: str, exc_traceback, recovery_attempted: bool):
-    """Analyze and provide device-specific troubleshooting advice."""
-    traceback_str = str(exc_traceback).lower() if exc_traceback else ""
+def _analyze_device_error(thread_name: str, exc_type: str, exc_value_lower: str, tb_lower: str, recovery_attempted: bool):
+    """Analyze and provide device-specific troubleshooting advice (message and traceback text already lowercased)."""
+    thread_name_lower = thread_name.lower()
     
     # RTDE-specific analysis
-    if "rtde" in traceback_str or "RTDEControlInterface" in str(exc_traceback):
+    if "rtde" in tb_lower:
         logger.error("RTDE COMMUNICATION ERROR:")
         logger.error("- Check robot controller connection and status")
         logger.error("- Verify RTDE interface is enabled on robot")
         logger.error("- Ensure robot is in Remote Control mode")
         
     # Camera thread analysis  
-    elif "VideoCap" in thread_name or "capture" in thread_name.lower() or "stream" in thread_name.lower():
+    elif "VideoCap" in thread_name or "capture" in thread_name_lower or "stream" in thread_name_lower:
         logger.error("CAMERA THREAD ERROR:")
         logger.error("- Check camera connection and drivers")
         logger.error("- Verify video capture device availability")
         logger.error("- Check camera permissions and resource access")
         
     # OPC-UA thread analysis
-    elif "MettlerToledo" in thread_name or "asyncio" in traceback_str or "opcua" in traceback_str:
+    elif "MettlerToledo" in thread_name or "asyncio" in tb_lower or "opcua" in tb_lower:
         logger.error("OPC-UA COMMUNICATION ERROR:")
         logger.error("- Check EasyMax device server connection")
         logger.error("- Verify OPC-UA server is running")
         logger.error("- Check network connectivity to reactor controller")
         
     # Socket/Network timeout analysis
-    elif exc_type in ["timeout", "socket.timeout", "TimeoutError"] or "timed out" in exc_value.lower():
+    elif exc_type in _TIMEOUT_TYPES or _TIMEOUT_MARKER in exc_value_lower:
         logger.error("NETWORK/COMMUNICATION TIMEOUT:")
         logger.error("- Check network connectivity to devices")
         logger.error("- Verify device controllers are responsive")
@@ -105,7 +119,7 @@ def _analyze_device_error(thread_name: str, exc_type: str, exc_value: str, exc_t
             logger.info("- Automatic recovery was attempted")
             
     # Robotiq gripper analysis
-    elif "Robotiq" in str(exc_traceback) or "gripper" in traceback_str:
+    elif "robotiq" in tb_lower or "gripper" in tb_lower:
         logger.error("ROBOTIQ GRIPPER ERROR:")
         logger.error("- Check gripper connection and power")
         logger.error("- Verify gripper TCP/IP communication")
@@ -152,6 +166,10 @@ def with_timeout(func: Callable, timeout_seconds: float, *args, **kwargs):
     """
     Execute a function with a timeout.
     
+    The function runs on a daemon worker thread, so this works from any thread
+    and honours sub-second timeouts. A function that times out is not
+    interrupted; it keeps running in the background and its result is discarded.
+    
     Args:
         func: Function to execute
         timeout_seconds: Timeout in seconds
@@ -168,32 +186,80 @@ def with_timeout(func: Callable, timeout_seconds: float, *args, **kwargs):
         robot_pos = with_timeout(robot.get_position, 5.0)
         hplc_data = with_timeout(hplc.run_analysis, 300.0)
     """
-    import signal
+    future = Future()
     
-    def timeout_handler(signum, frame):
-        raise TimeoutError(f"Function {func.__name__} timed out after {timeout_seconds} seconds")
-    
-    # Set up the timeout
-    old_handler = signal.signal(signal.SIGALRM, timeout_handler)
-    signal.alarm(int(timeout_seconds))
+    def run():
+        if future.set_running_or_notify_cancel():
+            try:
+                future.set_result(func(*args, **kwargs))
+            except BaseException as e:
+                future.set_exception(e)
     
+    threading.Thread(target=run, name=f"with_timeout-{func.__name__}", daemon=True).start()
     try:
-        result = func(*args, **kwargs)
-    finally:
-        # Restore the old handler and cancel the alarm
-        signal.signal(signal.SIGALRM, old_handler)
-        signal.alarm(0)
+        return future.result(timeout=timeout_seconds)
+    except FuturesTimeoutError:
+        if future.done():  # the function itself raised a TimeoutError
+            raise
+        raise TimeoutError(f"Function {func.__name__} timed out after {timeout_seconds} seconds") from None
+
+
+def with_poll_timeout(func: Callable, timeout_seconds: float, *args, interval: float = 0.01, **kwargs):
+    """
+    Call a function repeatedly until it returns a truthy value or the timeout expires.
     
-    return result
+    Args:
+        func: Polling function (e.g. a readiness check)
+        timeout_seconds: Timeout in seconds
+        *args: Function arguments
+        interval: Pause between polls in seconds (default: 0.01)
+        **kwargs: Function keyword arguments
+        
+    Returns:
+        The first truthy result
+        
+    Raises:
+        TimeoutError: If no truthy result arrives within timeout_seconds
+        
+    Examples:
+        with_poll_timeout(balance.is_stable, 10.0)
+    """
+    deadline = time.monotonic() + timeout_seconds
+    while True:
+        result = func(*args, **kwargs)
+        if result:
+            return result
+        remaining = deadline - time.monotonic()
+        if remaining <= 0:
+            raise TimeoutError(f"Function {func.__name__} did not succeed within {timeout_seconds} seconds")
+        time.sleep(min(interval, remaining))
 
 
 # ============================================================================
 # Retry and Recovery Functions
 # ============================================================================
 
-def socket_timeout_retry(operation_name=None, max_retries=5, retry_delay=3.0):
+def _retry_wait(instance, delay):
+    """Back off for delay seconds, measured on the monotonic clock.
+
+    If the instance has a ``_retry_abort_event`` (threading.Event), setting it wakes
+    the wait immediately and raises KeyboardInterrupt so shutdown doesn't sit out a backoff.
+    """
+    abort_event = getattr(instance, '_retry_abort_event', None)
+    deadline = time.monotonic() + delay
+    remaining = delay
+    while remaining > 0:
+        if abort_event is not None:
+            if abort_event.wait(remaining):
+                raise KeyboardInterrupt("Retry aborted: _retry_abort_event was set")
+        else:
+            time.sleep(remaining)
+        remaining = deadline - time.monotonic()
+
+
+def socket_timeout_retry(operation_name=None, max_retries=5, retry_delay=3.0, max_delay=60.0):
     """
-    Decorator for automatic retry on socket timeout with exponential backoff.
+    Decorator for automatic retry on socket timeout with jittered exponential backoff.
     
     Handles both sync socket timeouts and async timeout errors:
     - socket.timeout (from socket operations)
@@ -204,6 +270,11 @@ def socket_timeout_retry(operation_name=None, max_retries=5, retry_delay=3.0):
         operation_name: Custom name for the operation (default: function name)
         max_retries: Maximum number of retry attempts (default: 5)
         retry_delay: Initial delay between retries in seconds (default: 3.0)
+        max_delay: Upper bound for any single delay in seconds (default: 60.0)
+        
+    Delays after the first are drawn uniformly from [retry_delay, 3 * previous delay]
+    ("decorrelated jitter") so components retrying against the same controller spread out.
+    Setting ``self._retry_abort_event`` (a threading.Event) aborts a pending backoff.
         
     Usage:
         @socket_timeout_retry(max_retries=3)
@@ -211,43 +282,70 @@ def socket_timeout_retry(operation_name=None, max_retries=5, retry_delay=3.0):
             # Network communication code here
     """
     def decorator(func):
-        @wraps(func)
-        def wrapper(self, *args, **kwargs):
-            op_name = operation_name or f"{func.__name__}(...)" if args else f"{func.__name__}()"
+        op_name_args = operation_name or f"{func.__name__}(...)"
+        op_name_no_args = operation_name or f"{func.__name__}()"
+        class_loggers = {}  # class -> component logger, filled once the component is registered
+        
+        def get_component_logger(self):
+            cls = type(self)
+            component_logger = class_loggers.get(cls)
+            if component_logger is None:
+                component_logger = component_manager.component_loggers.get(cls.__name__)
+                if component_logger is None:
+                    return logger
+                class_loggers[cls] = component_logger
+            return component_logger
+        
+        def retry_after_timeout(self, args, kwargs, error):
+            op_name = op_name_args if args else op_name_no_args
             actual_max_retries = getattr(self, '_socket_retry_max_retries', max_retries)
             actual_retry_delay = getattr(self, '_socket_retry_delay', retry_delay)
             current_delay = actual_retry_delay
+            component_logger = get_component_logger(self)
+            attempt = 0
             
-            # Try to find component-specific logger based on class name
-            class_name = type(self).__name__
-            component_logger = component_manager.component_loggers.get(class_name) or logger
-            
-            for attempt in range(actual_max_retries):
+            while True:
+                component_logger.error(f"Timeout during {op_name} (attempt {attempt + 1}/{actual_max_retries})")
+                component_logger.error(f"Timeout details: {type(error).__name__}: {error}")
+                component_logger.error(f"This likely indicates network communication issues with device controller")
+                
+                if attempt >= actual_max_retries - 1:
+                    component_logger.error(f"All {actual_max_retries} attempts failed for {op_name} due to timeout")
+                    component_logger.error("This indicates a persistent network communication issue with the device")
+                    raise error
+                
+                component_logger.warning(f"Retrying {op_name} in {current_delay:.1f} seconds...")
+                _retry_wait(self, current_delay)
+                # Jittered exponential backoff for subsequent retries
+                current_delay = min(max_delay, random.uniform(actual_retry_delay, current_delay * 3))
+                attempt += 1
+                
                 try:
                     return func(self, *args, **kwargs)
-                except (socket.timeout, asyncio.TimeoutError, TimeoutError) as e:
-                    component_logger.error(f"Timeout during {op_name} (attempt {attempt + 1}/{actual_max_retries})")
-                    component_logger.error(f"Timeout details: {type(e).__name__}: {e}")
-                    component_logger.error(f"This likely indicates network communication issues with device controller")
-                    
-                    if attempt < actual_max_retries - 1:
-                        component_logger.warning(f"Retrying {op_name} in {current_delay:.1f} seconds...")
-                        time.sleep(current_delay)
-                        # Exponential backoff for subsequent retries
-                        current_delay *= 1.5
-                    else:
-                        component_logger.error(f"All {actual_max_retries} attempts failed for {op_name} due to timeout")
-                        component_logger.error("This indicates a persistent network communication issue with the device")
-                        raise
+                except _SOCKET_TIMEOUT_ERRORS as e:
+                    error = e
                 except Exception as e:
-                    # Non-timeout errors - don't retry, log and re-raise immediately
                     component_logger.error(f"{op_name} failed with non-timeout error: {type(e).__name__}: {e}")
                     raise
+        
+        @wraps(func)
+        def wrapper(self, *args, **kwargs):
+            # Fast path: first attempt runs without any retry bookkeeping
+            try:
+                return func(self, *args, **kwargs)
+            except _SOCKET_TIMEOUT_ERRORS as e:
+                error = e
+            except Exception as e:
+                # Non-timeout errors - don't retry, log and re-raise immediately
+                op_name = op_name_args if args else op_name_no_args
+                get_component_logger(self).error(f"{op_name} failed with non-timeout error: {type(e).__name__}: {e}")
+                raise
+            return retry_after_timeout(self, args, kwargs, error)
         return wrapper
     return decorator
 
 
-def balance_error_retry(max_retries=3, retry_delay=1.0, acceptable_errors=None):
+def balance_error_retry(max_retries=3, retry_delay=1.0, acceptable_errors=None, max_delay=60.0):
     """
     Decorator to handle balance operation errors with automatic retry and comprehensive logging.
     
@@ -255,6 +353,9 @@ def balance_error_retry(max_retries=3, retry_delay=1.0, acceptable_errors=None):
         max_retries: Maximum number of retry attempts (default: 3)
         retry_delay: Initial delay between retries in seconds (default: 1.0)
         acceptable_errors: List of exception types that should be retried (default: common balance errors)
+        max_delay: Upper bound for any single delay in seconds (default: 60.0)
+    
+    Delays use the same decorrelated jitter and ``_retry_abort_event`` hook as socket_timeout_retry.
     
     Usage:
         @balance_error_retry()
@@ -275,42 +376,68 @@ def balance_error_retry(max_retries=3, retry_delay=1.0, acceptable_errors=None):
             RuntimeError,    # Balance not ready
         ]
     
+    acceptable_errors = tuple(acceptable_errors)
+    
     def decorator(func):
-        @wraps(func)
-        def wrapper(self, *args, **kwargs):
-            operation_name = f"balance_{func.__name__}"
-            current_delay = retry_delay
-            
+        operation_name = f"balance_{func.__name__}"
+        cached_logger = None  # resolved on the first call made after the balance is registered
+        
+        def get_balance_logger():
+            nonlocal cached_logger
             # Use balance component logger if available, otherwise fall back to generic logger
-            balance_logger = component_manager.component_loggers.get("MTXPRBalance") or logger
+            if cached_logger is None:
+                cached_logger = component_manager.component_loggers.get("MTXPRBalance")
+            return cached_logger or logger
+        
+        def retry_after_error(self, args, kwargs, error):
+            balance_logger = get_balance_logger()
+            current_delay = retry_delay
+            attempt = 0
             
-            for attempt in range(max_retries):
+            while True:
+                balance_logger.error(f"ERROR: Balance error in {operation_name} (attempt {attempt + 1}/{max_retries})")
+                balance_logger.error(f"Error details: {type(error).__name__}: {error}")
+                
+                if attempt >= max_retries - 1:
+                    balance_logger.error(f"FAILED: All {max_retries} attempts failed for {operation_name}")
+                    raise error
+                
+                balance_logger.warning(f"RETRY: Retrying {operation_name} in {current_delay:.1f} seconds...")
+                balance_logger.warning("HINT: Possible causes: balance not stable, door open, vibration, scale drift")
+                _retry_wait(self, current_delay)
+                current_delay = min(max_delay, random.uniform(retry_delay, current_delay * 3))  # Jittered backoff
+                attempt += 1
+                
                 try:
-                    balance_logger.debug(f"Starting {operation_name} (attempt {attempt + 1}/{max_retries})")
+                    if balance_logger.isEnabledFor(logging.DEBUG):
+                        balance_logger.debug(f"Starting {operation_name} (attempt {attempt + 1}/{max_retries})")
                     result = func(self, *args, **kwargs)
-                    
-                    if attempt > 0:  # Log successful retry
-                        balance_logger.info(f"SUCCESS: {operation_name} succeeded after {attempt + 1} attempts")
-                    
-                    return result
-                    
-                except tuple(acceptable_errors) as e:
-                    balance_logger.error(f"ERROR: Balance error in {operation_name} (attempt {attempt + 1}/{max_retries})")
-                    balance_logger.error(f"Error details: {type(e).__name__}: {e}")
-                    
-                    if attempt < max_retries - 1:
-                        balance_logger.warning(f"RETRY: Retrying {operation_name} in {current_delay:.1f} seconds...")
-                        balance_logger.warning("HINT: Possible causes: balance not stable, door open, vibration, scale drift")
-                        time.sleep(current_delay)
-                        current_delay *= 1.5  # Exponential backoff
-                    else:
-                        balance_logger.error(f"FAILED: All {max_retries} attempts failed for {operation_name}")
-                        raise
-                        
+                except acceptable_errors as e:
+                    error = e
+                    continue
                 except Exception as e:
                     # Non-retryable errors (programming errors, etc.)
                     balance_logger.error(f"FATAL: Non-retryable error in {operation_name}: {type(e).__name__}: {e}")
                     raise
+                
+                balance_logger.info(f"SUCCESS: {operation_name} succeeded after {attempt + 1} attempts")
+                return result
+        
+        @wraps(func)
+        def wrapper(self, *args, **kwargs):
+            # Fast path: first attempt runs without any retry bookkeeping
+            balance_logger = get_balance_logger()
+            if balance_logger.isEnabledFor(logging.DEBUG):
+                balance_logger.debug(f"Starting {operation_name} (attempt 1/{max_retries})")
+            try:
+                return func(self, *args, **kwargs)
+            except acceptable_errors as e:
+                error = e
+            except Exception as e:
+                # Non-retryable errors (programming errors, etc.)
+                balance_logger.error(f"FATAL: Non-retryable error in {operation_name}: {type(e).__name__}: {e}")
+                raise
+            return retry_after_error(self, args, kwargs, error)
                     
         return wrapper
     return decorator
\ No newline at end of file
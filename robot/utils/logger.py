@@ -1,10 +1,14 @@
 # logger.py
+import atexit
 import logging
+import logging.handlers
+import queue
 import socket
 import getpass
-import traceback
 import functools
 import sys
+import time
+from contextvars import ContextVar
 from datetime import datetime
 from pathlib import Path
 from io import StringIO
@@ -60,6 +64,10 @@ suppress_external_loggers()
 # Default flag to determine whether file logging is enabled or not
 is_file_logging_enabled = False  # Start with file logging disabled
 current_log_file = None  # Track current log file to prevent duplicates
+# File logging runs on a QueueListener thread so logger calls never block on disk I/O
+_file_handler: Optional[logging.FileHandler] = None
+_file_queue_handler: Optional[logging.handlers.QueueHandler] = None
+_file_listener: Optional[logging.handlers.QueueListener] = None
 
 
 def file_log(enable: bool, filename=None, path=None, logger_name=None):
@@ -76,7 +84,7 @@ def file_log(enable: bool, filename=None, path=None, logger_name=None):
     
     # If file logging is already enabled, don't create another file handler
     if enable and is_file_logging_enabled and current_log_file:
-        print(f"File logging already enabled, using existing log: {current_log_file}")
+        logger.debug("File logging already enabled, using existing log: %s", current_log_file)
         return
     
     is_file_logging_enabled = enable
@@ -97,14 +105,12 @@ def add_file_handler(filename=None, path=None, logger_name=None):
     :param logger_name: The logger name to include in filename. If None, uses 'lle-workflow'.
 
     """
-    global current_log_file
+    global current_log_file, _file_handler, _file_queue_handler, _file_listener
     
     # Check if a file handler already exists
-    for handler in logger.handlers:
-        if isinstance(handler, logging.FileHandler):
-            current_log_file = handler.baseFilename
-            print(f"File logging already active: {current_log_file}")
-            return
+    if _file_listener is not None:
+        logger.debug("File logging already active: %s", current_log_file)
+        return
     
     if path is None:
         # Use ~/Logs/ as default path (cross-platform home directory)
@@ -126,23 +132,37 @@ def add_file_handler(filename=None, path=None, logger_name=None):
     # Create full file path
     full_path = path / filename
 
-    file_handler = logging.FileHandler(str(full_path))
-    file_handler.setFormatter(formatter)
-    logger.addHandler(file_handler)
+    _file_handler = logging.FileHandler(str(full_path))
+    _file_handler.setFormatter(formatter)
+    _file_queue_handler = logging.handlers.QueueHandler(queue.Queue(-1))
+    _file_listener = logging.handlers.QueueListener(
+        _file_queue_handler.queue, _file_handler, respect_handler_level=True)
+    _file_listener.start()
+    logger.addHandler(_file_queue_handler)
     current_log_file = str(full_path)
-    print(f"Logging to file: {full_path}")
+    logger.info("Logging to file: %s", full_path)
 
 
 def remove_file_handler():
     """ Remove the file handler from the logger if it exists. """
-    global current_log_file
-    for handler in logger.handlers:
-        if isinstance(handler, logging.FileHandler):
-            logger.removeHandler(handler)
-            handler.close()  # Properly close the file handler
-            print("File logging disabled.")
-            current_log_file = None
-            break
+    global current_log_file, _file_handler, _file_queue_handler, _file_listener
+    if _file_listener is None:
+        return
+    logger.removeHandler(_file_queue_handler)
+    _file_listener.stop()  # writes out anything still queued
+    _file_handler.close()  # Properly close the file handler
+    _file_handler = None
+    _file_queue_handler = None
+    _file_listener = None
+    logger.info("File logging disabled.")
+    current_log_file = None
+
+
+@atexit.register
+def _drain_file_log():
+    """Write out records still queued for the log file at interpreter exit."""
+    if _file_listener is not None:
+        _file_listener.stop()
 
 
 def log_exception(func):
@@ -155,13 +175,8 @@ def log_exception(func):
         try:
             return func(*args, **kwargs)
         except Exception as e:
-            # Log the exception with full traceback
-            logger.error(f"EXCEPTION in {func.__name__}: {type(e).__name__}: {e}")
-            logger.error(f"Traceback:\n{traceback.format_exc()}")
-            
-            # Also print a clean error message to console
-            print(f"\nERROR: {func.__name__} failed: {type(e).__name__}: {e}")
-            print("Full error details have been logged.")
+            # Log the exception with full traceback (formatted only if a handler emits the record)
+            logger.exception("EXCEPTION in %s: %s: %s", func.__name__, type(e).__name__, e)
             
             # Re-raise the exception so normal error handling still works
             raise
@@ -180,12 +195,8 @@ def log_and_catch_exception(func):
         try:
             return func(*args, **kwargs)
         except Exception as e:
-            # Log the exception with full traceback
-            logger.error(f"CAUGHT EXCEPTION in {func.__name__}: {type(e).__name__}: {e}")
-            logger.error(f"Traceback:\n{traceback.format_exc()}")
-            
-            # Print a clean error message to console
-            print(f"\nWARNING: {func.__name__} failed but continuing: {type(e).__name__}: {e}")
+            # Log the exception with full traceback (formatted only if a handler emits the record)
+            logger.exception("CAUGHT EXCEPTION in %s (continuing): %s: %s", func.__name__, type(e).__name__, e)
             
             # Return None instead of raising
             return None
@@ -196,6 +207,50 @@ def log_and_catch_exception(func):
 # FUNCTION LOGGING DECORATORS
 # =============================================================================
 
+class _PrintCapture:
+    """
+    stdout replacement used by log_function_calls(capture_prints=True).
+    Text is echoed to the original stdout and logged one record per complete line; partial
+    lines are buffered until their newline arrives (or flush_lines() at function exit).
+    """
+    def __init__(self, original_stdout, log_method, func_name):
+        self.original_stdout = original_stdout
+        self.log_method = log_method
+        self.func_name = func_name
+        self._buf = []
+        # If a console handler already writes to this stream, echoing would print every line twice
+        self._echo = not any(
+            isinstance(h, logging.StreamHandler) and not isinstance(h, logging.FileHandler)
+            and h.stream is original_stdout
+            for h in logger.handlers
+        )
+
+    def write(self, text):
+        if self._echo:
+            self.original_stdout.write(text)
+        self._buf.append(text)
+        if '\n' in text:
+            complete, _, rest = ''.join(self._buf).rpartition('\n')
+            self._buf = [rest] if rest else []
+            self._log_lines(complete)
+        return len(text)
+
+    def flush(self):
+        self.original_stdout.flush()
+
+    def flush_lines(self):
+        """Log whatever is left in the buffer (a last line without a newline)."""
+        if self._buf:
+            remainder = ''.join(self._buf)
+            self._buf = []
+            self._log_lines(remainder)
+
+    def _log_lines(self, text):
+        for line in text.splitlines():
+            if line.strip():
+                self.log_method(f"[{self.func_name}] {line}")
+
+
 def log_function_calls(
     log_level: str = 'info',
     log_args: bool = False,
@@ -228,47 +283,43 @@ def log_function_calls(
             return "result"
     """
     
+    # Resolve the level once; unknown names fall back to INFO like the logger method lookup below
+    level = logging.getLevelName(log_level.upper())
+    if not isinstance(level, int):
+        level = logging.INFO
+
     def decorator(func: Callable) -> Callable:
+        # Get the appropriate logger method
+        log_method = getattr(logger, log_level.lower(), logger.info)
+        func_name = func.__name__
+        # func_name is fixed, so build the message templates once; values are %-formatted lazily
+        entry_msg = f"[{func_name}] ENTRY: Starting {func_name}"
+        entry_args_fmt = f"[{func_name}] ENTRY: {func_name}(%s)"
+        exit_duration_fmt = f"[{func_name}] EXIT: Completed in %.3fs"
+        exit_duration_return_fmt = f"[{func_name}] EXIT: Completed in %.3fs, returned: %r"
+        exit_return_fmt = f"[{func_name}] EXIT: returned: %r"
+        exit_msg = f"[{func_name}] EXIT: Completed"
+        error_duration_fmt = f"[{func_name}] ERROR: Exception after %.3fs: %s: %s"
+        error_fmt = f"[{func_name}] ERROR: Exception: %s: %s"
+
         @functools.wraps(func)
         def wrapper(*args, **kwargs):
-            import time
-            
-            # Get the appropriate logger method
-            log_method = getattr(logger, log_level.lower(), logger.info)
-            func_name = func.__name__
-            
+            # Nothing would be logged: skip the entry/exit formatting and print capture entirely
+            if not logger.isEnabledFor(level):
+                return func(*args, **kwargs)
+
             # Log function entry
             if log_args and (args or kwargs):
                 args_str = ', '.join([repr(a) for a in args])
                 kwargs_str = ', '.join([f"{k}={repr(v)}" for k, v in kwargs.items()])
                 all_args = ', '.join(filter(None, [args_str, kwargs_str]))
-                log_method(f"[{func_name}] ENTRY: {func_name}({all_args})")
+                log_method(entry_args_fmt, all_args)
             else:
-                log_method(f"[{func_name}] ENTRY: Starting {func_name}")
+                log_method(entry_msg)
             
-            start_time = time.time() if log_duration else None
+            start_time = time.monotonic() if log_duration else None
             original_stdout = sys.stdout
-            # Create a real-time logging wrapper instead of buffering
-            class RealTimeLogger:
-                def __init__(self, original_stdout, log_method, func_name):
-                    self.original_stdout = original_stdout
-                    self.log_method = log_method
-                    self.func_name = func_name
-                    
-                def write(self, text):
-                    # Write to original stdout for console output
-                    self.original_stdout.write(text)
-                    # Also log each line immediately (skip empty lines)
-                    if text.strip():
-                        # Handle multi-line strings
-                        for line in text.strip().split('\n'):
-                            if line.strip():
-                                self.log_method(f"[{self.func_name}] {line}")
-                
-                def flush(self):
-                    self.original_stdout.flush()
-            
-            real_time_logger = RealTimeLogger(sys.stdout, log_method, func_name) if capture_prints else None
+            real_time_logger = _PrintCapture(sys.stdout, log_method, func_name) if capture_prints else None
             
             try:
                 # Replace stdout with real-time logger if requested
@@ -279,38 +330,54 @@ def log_function_calls(
                 result = func(*args, **kwargs)
                 
                 # Log function exit
-                if log_duration and start_time:
-                    duration = time.time() - start_time
+                if start_time is not None:
+                    duration = time.monotonic() - start_time
                     if log_return and result is not None:
-                        log_method(f"[{func_name}] EXIT: Completed in {duration:.3f}s, returned: {repr(result)}")
+                        log_method(exit_duration_return_fmt, duration, result)
                     else:
-                        log_method(f"[{func_name}] EXIT: Completed in {duration:.3f}s")
+                        log_method(exit_duration_fmt, duration)
                 else:
                     if log_return and result is not None:
-                        log_method(f"[{func_name}] EXIT: returned: {repr(result)}")
+                        log_method(exit_return_fmt, result)
                     else:
-                        log_method(f"[{func_name}] EXIT: Completed")
+                        log_method(exit_msg)
                 
                 return result
                 
             except Exception as e:
                 # Log exception
-                if log_duration and start_time:
-                    duration = time.time() - start_time
-                    log_method(f"[{func_name}] ERROR: Exception after {duration:.3f}s: {type(e).__name__}: {e}")
+                if start_time is not None:
+                    log_method(error_duration_fmt, time.monotonic() - start_time, type(e).__name__, e)
                 else:
-                    log_method(f"[{func_name}] ERROR: Exception: {type(e).__name__}: {e}")
+                    log_method(error_fmt, type(e).__name__, e)
                 raise
                 
             finally:
                 # Always restore stdout
                 if capture_prints:
                     sys.stdout = original_stdout
+                    real_time_logger.flush_lines()
                     
         return wrapper
     return decorator
 
 
+# Name of the function currently inside @log_with_function_name (per thread / task)
+_current_function_name: ContextVar[Optional[str]] = ContextVar('log_function_name', default=None)
+
+
+class _FunctionNameFilter(logging.Filter):
+    """Prefix records with the function name set by @log_with_function_name, if any."""
+    def filter(self, record):
+        func_name = _current_function_name.get()
+        if func_name is not None:
+            record.msg = f"[{func_name}] {record.msg}"
+        return True
+
+
+logger.addFilter(_FunctionNameFilter())
+
+
 def log_with_function_name(log_level: str = 'info'):
     """
     Simple decorator that adds function name prefix to all logger calls within the function.
@@ -321,47 +388,15 @@ def log_with_function_name(log_level: str = 'info'):
             logger.info("This message")  # Becomes "[my_function] This message"
     """
     def decorator(func: Callable) -> Callable:
+        func_name = func.__name__
+
         @functools.wraps(func)
         def wrapper(*args, **kwargs):
-            func_name = func.__name__
-            
-            # Store original logger methods
-            original_debug = logger.debug
-            original_info = logger.info
-            original_warning = logger.warning
-            original_error = logger.error
-            original_critical = logger.critical
-            
-            # Create wrapped logger methods that add function name prefix
-            def wrapped_debug(msg, *args, **kwargs):
-                return original_debug(f"[{func_name}] {msg}", *args, **kwargs)
-            def wrapped_info(msg, *args, **kwargs):
-                return original_info(f"[{func_name}] {msg}", *args, **kwargs)
-            def wrapped_warning(msg, *args, **kwargs):
-                return original_warning(f"[{func_name}] {msg}", *args, **kwargs)
-            def wrapped_error(msg, *args, **kwargs):
-                return original_error(f"[{func_name}] {msg}", *args, **kwargs)
-            def wrapped_critical(msg, *args, **kwargs):
-                return original_critical(f"[{func_name}] {msg}", *args, **kwargs)
-            
+            token = _current_function_name.set(func_name)
             try:
-                # Replace logger methods temporarily
-                logger.debug = wrapped_debug
-                logger.info = wrapped_info
-                logger.warning = wrapped_warning
-                logger.error = wrapped_error
-                logger.critical = wrapped_critical
-                
-                # Execute function
                 return func(*args, **kwargs)
-                
             finally:
-                # Always restore original logger methods
-                logger.debug = original_debug
-                logger.info = original_info
-                logger.warning = original_warning
-                logger.error = original_error
-                logger.critical = original_critical
+                _current_function_name.reset(token)
                 
         return wrapper
     return decorator
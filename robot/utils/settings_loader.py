@@ -3,9 +3,25 @@ Simple Settings Loader for SDL2
 Just loads settings from YAML file when needed.
 """
 
+import copy
+import logging
+import os
 import yaml
+from functools import lru_cache
 from pathlib import Path
-from typing import Dict, Any, Optional
+from typing import Dict, Any, Optional, Sequence, Tuple
+
+# libyaml's C loader when PyYAML was built with it
+_SafeLoader = getattr(yaml, 'CSafeLoader', yaml.SafeLoader)
+
+logger = logging.getLogger(__name__)
+
+
+@lru_cache(maxsize=32)
+def _load_yaml_cached(path_str: str, mtime_ns: int) -> Dict[str, Any]:
+    """Parse a YAML file once per (path, modification time); editing the file invalidates it."""
+    with open(path_str, 'rb') as f:
+        return yaml.load(f, Loader=_SafeLoader) or {}
 
 
 def load_sdl2_settings(settings_file: Path = None) -> Dict[str, Any]:
@@ -23,14 +39,30 @@ def load_sdl2_settings(settings_file: Path = None) -> Dict[str, Any]:
         settings_file = Path(__file__).resolve().parents[2] / "implementations" / "SDL2" / "deck_sdl2_settings.yaml"
     
     try:
-        with open(settings_file, 'r') as f:
-            settings = yaml.safe_load(f)
-        return settings or {}
+        path_str = os.fspath(settings_file)
+        # Callers may modify what they get back, so hand out a copy of the cached parse
+        return copy.deepcopy(_load_yaml_cached(path_str, os.stat(path_str).st_mtime_ns))
     except Exception as e:
-        print(f"Warning: Could not load settings from {settings_file}: {e}")
+        logger.warning("Could not load settings from %s: %s", settings_file, e)
         return {}
 
 
+@lru_cache(maxsize=128)
+def _split_key(dotted_key: str) -> Tuple[str, ...]:
+    """Split a dotted settings key like 'cameras.easymax' once and remember the result."""
+    return tuple(dotted_key.split('.'))
+
+
+def _walk(settings: Dict[str, Any], keys: Tuple[str, ...], default: Any = None) -> Any:
+    """Follow keys down the nested settings dict, returning default if any level is missing."""
+    result = settings
+    for key in keys:
+        if not isinstance(result, dict) or key not in result:
+            return default
+        result = result[key]
+    return result
+
+
 def get_component_settings(component_name: str, settings_file: Path = None) -> Dict[str, Any]:
     """
     Get settings for a specific component.
@@ -46,16 +78,8 @@ def get_component_settings(component_name: str, settings_file: Path = None) -> D
     all_settings = load_sdl2_settings(settings_file)
     
     # Handle nested keys like 'cameras.easymax'
-    if '.' in component_name:
-        keys = component_name.split('.')
-        result = all_settings
-        for key in keys:
-            result = result.get(key, {})
-            if not isinstance(result, dict):
-                return {}
-        return result
-    else:
-        return all_settings.get(component_name, {})
+    result = _walk(all_settings, _split_key(component_name), {})
+    return result if isinstance(result, dict) else {}
 
 
 def get_setting(component_name: str, setting_key: str, default: Any = None, settings_file: Path = None) -> Any:
@@ -75,6 +99,22 @@ def get_setting(component_name: str, setting_key: str, default: Any = None, sett
     return component_settings.get(setting_key, default)
 
 
+def get_settings_batch(keys: Sequence[str], default: Any = None, settings_file: Path = None) -> Dict[str, Any]:
+    """
+    Get several settings with a single load of the settings file.
+    
+    Args:
+        keys: Dotted setting paths (e.g., ['robot.rob_ip', 'cameras.easymax.port'])
+        default: Value used for keys that are not found
+        settings_file: Path to settings file
+    
+    Returns:
+        Dictionary mapping each requested key to its value or default
+    """
+    all_settings = load_sdl2_settings(settings_file)
+    return {key: _walk(all_settings, _split_key(key), default) for key in keys}
+
+
 # Example usage:
 if __name__ == "__main__":
     # Load all settings
@@ -85,15 +85,12 @@ class PiCam:
         except Exception as e:
             return f"Connection failed: {e}"
     
-    def capture_photo(self, filename: Optional[str] = None) -> Optional[str]:
+    def capture_bytes(self) -> Optional[bytearray]:
         """
-        Capture a photo from Pi camera server
+        Capture a photo from Pi camera server and keep it in memory
         
-        Args:
-            filename: Optional custom filename
-            
         Returns:
-            Path to saved photo or None if failed
+            Encoded JPEG data or None if failed
         """
         try:
             # Connect to server
@@ -126,31 +123,20 @@ class PiCam:
                 sock.close()
                 return None
             
-            # Generate filename if not provided
-            if filename:
-                file_path = Path(self.config.download_dir) / filename
-            else:
-                timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
-                file_path = Path(self.config.download_dir) / f"capture_{timestamp}.jpg"
-            
-            # Receive photo data
+            # Receive photo data straight into one buffer of the announced size
+            data = bytearray(data_length)
+            view = memoryview(data)
             received_size = 0
-            with open(file_path, 'wb') as f:
-                while received_size < data_length:
-                    remaining = data_length - received_size
-                    chunk_size = min(4096, remaining)
-                    chunk = sock.recv(chunk_size)
-                    
-                    if not chunk:
-                        break
-                    
-                    f.write(chunk)
-                    received_size += len(chunk)
+            while received_size < data_length:
+                n = sock.recv_into(view[received_size:])
+                if not n:
+                    break
+                received_size += n
             
             sock.close()
             
             if received_size == data_length:
-                return str(file_path)
+                return data
             else:
                 print(f"Incomplete download: {received_size}/{data_length} bytes")
                 return None
@@ -159,6 +145,30 @@ class PiCam:
             print(f"Photo capture failed: {e}")
             return None
     
+    def photo_path(self, filename: Optional[str] = None) -> Path:
+        """Download path for a photo (timestamped name if not given)"""
+        if filename:
+            return Path(self.config.download_dir) / filename
+        timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
+        return Path(self.config.download_dir) / f"capture_{timestamp}.jpg"
+    
+    def capture_photo(self, filename: Optional[str] = None) -> Optional[str]:
+        """
+        Capture a photo from Pi camera server
+        
+        Args:
+            filename: Optional custom filename
+            
+        Returns:
+            Path to saved photo or None if failed
+        """
+        data = self.capture_bytes()
+        if data is None:
+            return None
+        file_path = self.photo_path(filename)
+        file_path.write_bytes(data)
+        return str(file_path)
+    
     def get_latest_photo(self) -> Optional[str]:
         """Get the path to the latest photo in download directory"""
         photo_dir = Path(self.config.download_dir)
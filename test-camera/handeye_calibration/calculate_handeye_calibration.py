@@ -13,6 +13,25 @@ from datetime import datetime
 from pathlib import Path
 from scipy.spatial.transform import Rotation as R
 
+def rodrigues_batch(rvecs):
+    """
+    Convert rotation vectors to rotation matrices in one vectorized call
+    
+    Args:
+        rvecs: (N, 3) array of rotation vectors
+        
+    Returns:
+        np.ndarray: (N, 3, 3) rotation matrices
+    """
+    return R.from_rotvec(np.asarray(rvecs, dtype=np.float64).reshape(-1, 3)).as_matrix()
+
+def _stack_poses(robot_poses, camera_poses):
+    """Stack saved poses into (N, 3) position / rotation-vector arrays"""
+    robot_poses = np.asarray(robot_poses, dtype=np.float64).reshape(-1, 6)
+    camera_t = np.array([p['translation'] for p in camera_poses], dtype=np.float64).reshape(-1, 3)
+    camera_r = np.array([p['rotation_vector'] for p in camera_poses], dtype=np.float64).reshape(-1, 3)
+    return robot_poses[:, :3], robot_poses[:, 3:], camera_t, camera_r
+
 class HandEyeCalibrator:
     """Solve hand-eye calibration problem"""
     
@@ -50,38 +69,21 @@ class HandEyeCalibrator:
         Returns:
             tuple: (robot_to_base_R, robot_to_base_t, camera_to_tag_R, camera_to_tag_t)
         """
-        robot_poses = self.calibration_data['robot_poses']
-        camera_poses = self.calibration_data['camera_poses']
+        print("🔄 Preparing calibration matrices...")
         
-        robot_to_base_R = []
-        robot_to_base_t = []
-        camera_to_tag_R = []
-        camera_to_tag_t = []
+        # Robot pose: [x, y, z, rx, ry, rz]; camera pose: translation and rotation vector
+        robot_pos, robot_rot_vec, camera_pos, camera_rot_vec = _stack_poses(
+            self.calibration_data['robot_poses'], self.calibration_data['camera_poses'])
         
-        print("🔄 Preparing calibration matrices...")
+        # Convert all rotation vectors to rotation matrices at once; OpenCV takes
+        # per-pose lists (views into the batch arrays) with (3, 1) translations
+        robot_to_base_R = list(rodrigues_batch(robot_rot_vec))
+        camera_to_tag_R = list(rodrigues_batch(camera_rot_vec))
+        robot_to_base_t = list(robot_pos.reshape(-1, 3, 1))
+        camera_to_tag_t = list(camera_pos.reshape(-1, 3, 1))
         
-        for i, (robot_pose, camera_pose) in enumerate(zip(robot_poses, camera_poses)):
-            # Robot pose: [x, y, z, rx, ry, rz]
-            robot_pos = np.array(robot_pose[:3])
-            robot_rot_vec = np.array(robot_pose[3:])
-            
-            # Convert robot rotation vector to rotation matrix
-            robot_rot_mat = R.from_rotvec(robot_rot_vec).as_matrix()
-            
-            # Camera pose: translation and rotation vector
-            camera_pos = np.array(camera_pose['translation'])
-            camera_rot_vec = np.array(camera_pose['rotation_vector'])
-            
-            # Convert camera rotation vector to rotation matrix
-            camera_rot_mat = R.from_rotvec(camera_rot_vec).as_matrix()
-            
-            # Store for hand-eye calibration
-            robot_to_base_R.append(robot_rot_mat)
-            robot_to_base_t.append(robot_pos.reshape(3, 1))
-            camera_to_tag_R.append(camera_rot_mat)
-            camera_to_tag_t.append(camera_pos.reshape(3, 1))
-            
-            print(f"   Point {i+1}: Robot pos {robot_pos}, Camera dist {np.linalg.norm(camera_pos):.3f}m")
+        for i, (pos, dist) in enumerate(zip(robot_pos, np.linalg.norm(camera_pos, axis=1))):
+            print(f"   Point {i+1}: Robot pos {pos}, Camera dist {dist:.3f}m")
         
         return robot_to_base_R, robot_to_base_t, camera_to_tag_R, camera_to_tag_t
     
@@ -179,21 +181,21 @@ class HandEyeCalibrator:
         R_cam_to_robot = np.array(self.result['camera_to_robot_R'])
         t_cam_to_robot = np.array(self.result['camera_to_robot_t']).reshape(3, 1)
         
-        robot_poses = self.calibration_data['robot_poses']
-        camera_poses = self.calibration_data['camera_poses']
+        robot_positions, robot_rot_vecs, camera_positions, camera_rot_vecs = _stack_poses(
+            self.calibration_data['robot_poses'], self.calibration_data['camera_poses'])
+        robot_rot_mats = rodrigues_batch(robot_rot_vecs)
+        camera_rot_mats = rodrigues_batch(camera_rot_vecs)
         
         errors = []
         
-        for i, (robot_pose, camera_pose) in enumerate(zip(robot_poses, camera_poses)):
+        for i in range(len(robot_positions)):
             # Robot pose
-            robot_pos = np.array(robot_pose[:3])
-            robot_rot_vec = np.array(robot_pose[3:])
-            robot_rot_mat = R.from_rotvec(robot_rot_vec).as_matrix()
+            robot_pos = robot_positions[i]
+            robot_rot_mat = robot_rot_mats[i]
             
             # Camera observation of tag
-            camera_pos = np.array(camera_pose['translation']).reshape(3, 1)
-            camera_rot_vec = np.array(camera_pose['rotation_vector'])
-            camera_rot_mat = R.from_rotvec(camera_rot_vec).as_matrix()
+            camera_pos = camera_positions[i]
+            camera_rot_mat = camera_rot_mats[i]
             
             # Transform tag pose from camera to robot frame
             # T_robot_to_tag = T_robot_to_base * T_base_to_robot * T_robot_to_camera * T_camera_to_tag
@@ -8,28 +8,48 @@ import numpy as np
 import cv2
 import yaml
 import json
+import mmap
+import queue
+import threading
 import time
 import argparse
-from datetime import datetime
+from datetime import datetime, timedelta
 from pathlib import Path
 import sys
 import os
 
-# Add parent directory to path to import our modules
-sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
-sys.path.append(os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'robots', 'ur'))
-sys.path.append(os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'camera', 'picam'))
-sys.path.append(os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'tests'))
+try:
+    import orjson
+except ImportError:  # fall back to the stdlib encoder
+    orjson = None
 
-# Force reload of URRobotInterface to pick up any recent changes
-import importlib
+# Add parent directory to path to import our modules (once, even if this module is re-imported)
+_project_dir = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+for _path in (_project_dir,
+              os.path.join(_project_dir, 'robots', 'ur'),
+              os.path.join(_project_dir, 'camera', 'picam'),
+              os.path.join(_project_dir, 'tests')):
+    if _path not in sys.path:
+        sys.path.append(_path)
+
+# Reload URRobotInterface to pick up edits made during an interactive session (SDL2_DEV_RELOAD=1)
 import ur_robot_interface
-importlib.reload(ur_robot_interface)
+if os.environ.get("SDL2_DEV_RELOAD"):
+    import importlib
+    importlib.reload(ur_robot_interface)
 
 from ur_robot_interface import URRobotInterface
 from picam import PiCam, PiCamConfig
 from test_apriltag_detection import AprilTagDetector
 
+def _imread_grayscale(image_path):
+    """Decode an image file to grayscale straight from a read-only memory map (None if unreadable)"""
+    try:
+        with open(image_path, 'rb') as f, mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mapped:
+            return cv2.imdecode(np.frombuffer(mapped, dtype=np.uint8), cv2.IMREAD_GRAYSCALE)
+    except (OSError, ValueError):  # missing or empty file
+        return None
+
 class HandEyeDataCollector:
     """Collect hand-eye calibration data for UR robot with wrist-mounted camera"""
     
@@ -44,6 +64,9 @@ class HandEyeDataCollector:
         """
         self.robot_ip = robot_ip
         self.apriltag_config = apriltag_config
+        self.robot = None
+        self.camera = None
+        self.detector = None
         
         # Initialize robot in read-only mode (no remote control needed)
         print("🤖 Initializing UR robot...")
@@ -65,32 +88,82 @@ class HandEyeDataCollector:
             calibration_file=apriltag_config.get('calibration_file')
         )
         
-        # Data storage
+        # Pose storage: one contiguous row per data point, grown by doubling
+        self._num_points = 0
+        self._robot_poses = np.empty((64, 6))   # Robot TCP poses in base frame
+        self._camera_tvecs = np.empty((64, 3))  # AprilTag translation in camera frame
+        self._camera_rvecs = np.empty((64, 3))  # AprilTag rotation vector in camera frame
+        
+        # Point timestamps are the session start plus a monotonic offset
+        self._start_time = datetime.now()
+        self._start_monotonic = time.monotonic()
+        
+        # Data storage (per-point metadata; poses are merged in by save_data)
         self.calibration_data = {
-            'robot_poses': [],      # Robot TCP poses in base frame
-            'camera_poses': [],     # AprilTag poses in camera frame
+            'camera_poses': [],     # Tag id, quality and image path per AprilTag pose
             'timestamps': [],       # Collection timestamps
             'robot_ip': robot_ip,
             'apriltag_config': apriltag_config,
-            'collection_date': datetime.now().isoformat()
+            'collection_date': self._start_time.isoformat()
         }
         
+        # Background detection: the next capture can start while the previous image is processed.
+        # maxsize=1 keeps at most one capture waiting; a further capture blocks until it is taken.
+        self._capture_queue = queue.Queue(maxsize=1)
+        self._results = queue.Queue()
+        self._detect_worker = threading.Thread(target=self._detection_loop, daemon=True)
+        self._detect_worker.start()
+        
         print("✅ Hand-eye data collector initialized")
     
-    def detect_apriltag_in_image(self, image_path):
+    @property
+    def num_points(self):
+        return self._num_points
+    
+    @property
+    def robot_poses(self):
+        """(N, 6) view of the collected robot TCP poses"""
+        return self._robot_poses[:self._num_points]
+    
+    @property
+    def camera_tvecs(self):
+        """(N, 3) view of the collected camera-to-tag translations"""
+        return self._camera_tvecs[:self._num_points]
+    
+    @property
+    def camera_rvecs(self):
+        """(N, 3) view of the collected camera-to-tag rotation vectors"""
+        return self._camera_rvecs[:self._num_points]
+    
+    def _store_pose(self, robot_pose, camera_to_tag_t, camera_to_tag_r):
+        """Write one data point into the pose arrays, doubling their capacity when full"""
+        n = self._num_points
+        if n == len(self._robot_poses):
+            self._robot_poses = np.concatenate((self._robot_poses, np.empty_like(self._robot_poses)))
+            self._camera_tvecs = np.concatenate((self._camera_tvecs, np.empty_like(self._camera_tvecs)))
+            self._camera_rvecs = np.concatenate((self._camera_rvecs, np.empty_like(self._camera_rvecs)))
+        self._robot_poses[n] = robot_pose
+        self._camera_tvecs[n] = np.ravel(camera_to_tag_t)
+        self._camera_rvecs[n] = np.ravel(camera_to_tag_r)
+        self._num_points = n + 1
+    
+    def detect_apriltag_in_image(self, image):
         """
         Detect AprilTag in captured image
         
         Args:
-            image_path: Path to captured image
+            image: Path to captured image, or an already decoded image array
             
         Returns:
             dict: AprilTag detection result or None
         """
-        image = cv2.imread(image_path)
-        if image is None:
-            print(f"❌ Failed to load image: {image_path}")
-            return None
+        if not isinstance(image, np.ndarray):
+            image_path = image
+            # The detector works on grayscale; decoding straight to one channel skips the BGR buffer and cvtColor
+            image = _imread_grayscale(image_path)
+            if image is None:
+                print(f"❌ Failed to load image: {image_path}")
+                return None
         
         detections = self.detector.detect_tags(image, estimate_pose=True)
         
@@ -113,53 +186,92 @@ class HandEyeDataCollector:
         
         return detection
     
-    def collect_data_point(self, pose_index, total_poses):
+    def collect_data_point(self, pose_index, total_poses, wait=True):
         """
         Collect single calibration data point
         
         Args:
             pose_index: Current pose index
             total_poses: Total number of poses
+            wait: If False, hand the capture to the background detector and return
+                  right away; the outcome is reported by wait_for_detections()
             
         Returns:
-            bool: True if data point collected successfully
+            bool: True if data point collected successfully (or was queued when wait=False)
         """
         print(f"\n📸 Collecting data point {pose_index + 1}/{total_poses}")
         
         # Get current robot pose
         robot_pose = self.robot.get_tcp_pose()
+        captured_at = time.monotonic()
         print(f"🤖 Robot TCP pose: {self.robot.format_pose(robot_pose)}")
         
-        # Capture image
+        # Capture image (kept in memory; decoded straight to grayscale for the detector)
         print("📷 Capturing image...")
-        image_path = self.camera.capture_photo()
-        if not image_path:
+        jpeg_data = self.camera.capture_bytes()
+        if not jpeg_data:
             print("❌ Failed to capture image")
             return False
         
-        # Wait for camera to stabilize
-        time.sleep(0.5)
+        if not wait:
+            self._capture_queue.put((pose_index, robot_pose, jpeg_data, captured_at))
+            return True
+        return self._process_capture(pose_index, robot_pose, jpeg_data, captured_at)
+    
+    def _detection_loop(self):
+        """Worker thread: detect and store queued captures in order"""
+        while True:
+            pose_index, robot_pose, jpeg_data, captured_at = self._capture_queue.get()
+            try:
+                self._results.put(self._process_capture(pose_index, robot_pose, jpeg_data, captured_at))
+            except Exception as e:
+                print(f"❌ Data point {pose_index + 1} failed: {e}")
+                self._results.put(False)
+            finally:
+                self._capture_queue.task_done()
+    
+    def wait_for_detections(self):
+        """
+        Wait for queued captures to finish processing
+        
+        Returns:
+            int: Number of queued captures stored successfully since the last call
+        """
+        self._capture_queue.join()
+        succeeded = 0
+        while not self._results.empty():
+            succeeded += self._results.get()
+        return succeeded
+    
+    def _process_capture(self, pose_index, robot_pose, jpeg_data, captured_at):
+        """Decode, detect and store one captured data point"""
+        image = cv2.imdecode(np.frombuffer(jpeg_data, dtype=np.uint8), cv2.IMREAD_GRAYSCALE)
+        if image is None:
+            print("❌ Failed to decode image")
+            return False
         
         # Detect AprilTag
         print("🔍 Detecting AprilTag...")
-        detection = self.detect_apriltag_in_image(image_path)
+        detection = self.detect_apriltag_in_image(image)
         
         if detection is None:
             print("❌ AprilTag detection failed")
             return False
         
+        # Keep the original JPEG for reference; write it in the background so collection doesn't wait on disk
+        image_path = self.camera.photo_path()
+        threading.Thread(target=image_path.write_bytes, args=(jpeg_data,)).start()
+        
         # Extract camera-to-tag transformation
         pose_data = detection['pose']
-        camera_to_tag_t = np.array(pose_data['translation_vector'])
-        camera_to_tag_r = np.array(pose_data['rotation_vector'])
+        camera_to_tag_t = pose_data['translation_vector']
+        camera_to_tag_r = pose_data['rotation_vector']
         
-        # Store data point
-        timestamp = datetime.now().isoformat()
+        # Store data point (stamped at capture time, not when the background detector got to it)
+        timestamp = (self._start_time + timedelta(seconds=captured_at - self._start_monotonic)).isoformat()
         
-        self.calibration_data['robot_poses'].append(robot_pose.tolist())
+        self._store_pose(robot_pose, camera_to_tag_t, camera_to_tag_r)
         self.calibration_data['camera_poses'].append({
-            'translation': camera_to_tag_t.tolist(),
-            'rotation_vector': camera_to_tag_r.tolist(),
             'tag_id': detection['tag_id'],
             'quality': detection['decision_margin'],
             'image_path': str(image_path)
@@ -190,7 +302,6 @@ class HandEyeDataCollector:
         
         input("\nPress ENTER to start collection...")
         
-        collected_count = 0
         pose_index = 0
         
         while True:
@@ -205,10 +316,12 @@ class HandEyeDataCollector:
             if user_input == 'q':
                 break
             
-            if self.collect_data_point(pose_index, -1):
-                collected_count += 1
+            # Detection runs in the background while the robot is moved to the next pose
+            if self.collect_data_point(pose_index, -1, wait=False):
                 pose_index += 1
         
+        collected_count = self.wait_for_detections()
+        
         print(f"\n📊 Collection Summary:")
         print(f"   Total data points collected: {collected_count}")
         print(f"   Minimum recommended: 10")
@@ -236,18 +349,31 @@ class HandEyeDataCollector:
         
         print(f"\n💾 Saving calibration data to: {output_path}")
         
-        with open(output_path, 'w') as f:
-            json.dump(self.calibration_data, f, indent=2)
+        # Same file layout as before: robot pose list plus one dict per camera pose
+        data = {
+            'robot_poses': self.robot_poses,
+            'camera_poses': [
+                {'translation': t, 'rotation_vector': r, **meta}
+                for t, r, meta in zip(self.camera_tvecs, self.camera_rvecs, self.calibration_data['camera_poses'])
+            ],
+        }
+        data.update((key, value) for key, value in self.calibration_data.items() if key not in data)
+        
+        if orjson is not None:
+            payload = orjson.dumps(data, option=orjson.OPT_INDENT_2 | orjson.OPT_SERIALIZE_NUMPY)
+        else:
+            payload = json.dumps(data, indent=2, default=lambda o: o.tolist()).encode()
+        output_path.write_bytes(payload)
         
         print(f"✅ Calibration data saved")
-        print(f"   Data points: {len(self.calibration_data['robot_poses'])}")
-        print(f"   File size: {output_path.stat().st_size} bytes")
+        print(f"   Data points: {self.num_points}")
+        print(f"   File size: {len(payload)} bytes")
         
         return output_path
     
     def close(self):
         """Clean up resources"""
-        if hasattr(self, 'robot'):
+        if self.robot is not None:
             self.robot.close()
 
 def main():
@@ -278,6 +404,7 @@ def main():
         'calibration_file': args.calibration_file
     }
     
+    collector = None
     try:
         collector = HandEyeDataCollector(
             robot_ip=args.robot_ip,
@@ -289,7 +416,7 @@ def main():
         collector.interactive_collection()
         
         # Save data
-        if len(collector.calibration_data['robot_poses']) > 0:
+        if collector.num_points > 0:
             output_path = collector.save_data(args.output)
             print(f"\n🎉 Data collection completed!")
             print(f"   Next step: python calculate_handeye_calibration.py --input {output_path}")
@@ -303,7 +430,7 @@ def main():
         import traceback
         traceback.print_exc()
     finally:
-        if 'collector' in locals():
+        if collector is not None:
             collector.close()
 
 if __name__ == "__main__":
@@ -4,6 +4,7 @@ Simple utility to get robot TCP pose or joint angles using URRobotInterface
 """
 
 import argparse
+import numpy as np
 from ur_robot_interface import URRobotInterface
 
 def main():
@@ -31,9 +32,8 @@ def main():
                     print(f"TCP: {robot.format_pose(tcp_pose)}")
                 
                 if args.mode in ['joints', 'both']:
-                    joint_angles = robot.get_joint_positions()
-                    joint_degrees = [f"{angle*180/3.14159:.1f}°" for angle in joint_angles]
-                    print(f"Joints: {joint_degrees}")
+                    joint_degrees = np.degrees(np.asarray(robot.get_joint_positions()))
+                    print("Joints:", np.array2string(joint_degrees, formatter={'float_kind': lambda a: f"{a:.1f}°"}))
                 
                 if args.mode == 'both':
                     print("-" * 50)
@@ -48,10 +48,10 @@ def main():
                 print(f"   Rotation: Rx={tcp_pose[3]:.3f}rad, Ry={tcp_pose[4]:.3f}rad, Rz={tcp_pose[5]:.3f}rad")
             
             if args.mode in ['joints', 'both']:
-                joint_angles = robot.get_joint_positions()
+                joint_degrees = np.degrees(np.asarray(robot.get_joint_positions()))
                 print(f"🔗 Joint Angles (degrees):")
-                for i, angle in enumerate(joint_angles):
-                    print(f"   Joint {i+1}: {angle*180/3.14159:.1f}°")
+                for i, angle in enumerate(joint_degrees):
+                    print(f"   Joint {i+1}: {angle:.1f}°")
         
     except KeyboardInterrupt:
         print("\n🛑 Stopped by user")
@@ -10,6 +10,9 @@ import rtde_control
 import rtde_receive
 from scipy.spatial.transform import Rotation as R
 
+# Compiled once; format_pose is called on every tick of the continuous readers
+_POSE_FORMAT = "[{:.3f}, {:.3f}, {:.3f}, {:.3f}, {:.3f}, {:.3f}]"
+
 class URRobotInterface:
     """Universal Robots interface using RTDE"""
     
@@ -227,8 +230,7 @@ class URRobotInterface:
     
     def format_pose(self, pose):
         """Format pose for nice printing"""
-        return (f"[{pose[0]:.3f}, {pose[1]:.3f}, {pose[2]:.3f}, "
-                f"{pose[3]:.3f}, {pose[4]:.3f}, {pose[5]:.3f}]")
+        return _POSE_FORMAT.format(*pose[:6])
     
     def close(self):
         """Close robot connection"""
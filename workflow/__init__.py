@@ -3,3 +3,27 @@ Workflows package for integrating robot arm and balance operations.
 """
 
 __version__ = "1.0.0"
+
+# Hardware drivers are imported on first attribute access (PEP 562), so importing the
+# package, or a small utility inside it, does not pay for prefect and the driver stacks
+_LAZY_ATTRS = {
+    "OpenTrons": ("matterlab_opentrons", "OpenTrons"),
+    "MTXPRBalance": ("matterlab_balances", "MTXPRBalance"),
+    "URController": ("robot.robot_control_URArm", "URController"),
+    "pHAnalyzer": ("pH_measure.pizerocam.src.image_req_client.ph_analyzer", "pHAnalyzer"),
+}
+
+
+def __getattr__(name):
+    try:
+        module_name, attr = _LAZY_ATTRS[name]
+    except KeyError:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}") from None
+    from importlib import import_module
+    value = getattr(import_module(module_name), attr)
+    globals()[name] = value  # later lookups skip __getattr__
+    return value
+
+
+def __dir__():
+    return sorted([*globals(), *_LAZY_ATTRS])
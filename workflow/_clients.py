@@ -0,0 +1,29 @@
+"""
+Process-wide balance and robot connections shared by the workflow scripts.
+
+The first call connects; later calls in the same process (re-running a workflow
+from a notebook or scheduler) reuse the live connection. Both are closed at exit.
+"""
+import atexit
+from functools import lru_cache
+
+from matterlab_balances import MTXPRBalance
+from robot.robot_control_URArm import URController
+from workflow.config import get_config
+
+
+@lru_cache(maxsize=1)
+def get_balance() -> MTXPRBalance:
+    """Connected MTXPRBalance for BALANCE_IP / BALANCE_PASSWORD."""
+    config = get_config()
+    balance = MTXPRBalance(host=config.balance_ip, password=config.balance_password)
+    atexit.register(balance.__exit__, None, None, None)
+    return balance
+
+
+@lru_cache(maxsize=1)
+def get_robot() -> URController:
+    """Connected URController for ROBOT_IP."""
+    rob = URController(ur3_ip=get_config().robot_ip)
+    atexit.register(rob.disconnect)
+    return rob
@@ -0,0 +1,53 @@
+"""
+Workflow configuration, read once per process.
+
+Credentials come from the environment (a .env file is loaded first); custom labware
+definitions default to the ones shipped inside matterlab_opentrons and can be
+redirected with LABWARE_DIR. The labware check lives in get_labware_dir() so the
+balance and robot workflows never depend on the OpenTrons files.
+"""
+import os
+from functools import lru_cache
+from importlib.util import find_spec
+from pathlib import Path
+from typing import NamedTuple, Optional
+
+from dotenv import load_dotenv
+
+LABWARE_FILES = (
+    "20mlvial_6_wellplate.json",
+    "phunit.json",
+    "al24wellplate_24_wellplate_15000ul.json",
+)
+
+
+class Config(NamedTuple):
+    balance_ip: Optional[str]
+    balance_password: Optional[str]
+    robot_ip: Optional[str]
+    opentrons_password: Optional[str]
+
+
+@lru_cache(maxsize=1)
+def get_config() -> Config:
+    """Read the credentials from the environment on first use."""
+    load_dotenv()
+    return Config(
+        balance_ip=os.environ.get("BALANCE_IP"),
+        balance_password=os.environ.get("BALANCE_PASSWORD"),
+        robot_ip=os.environ.get("ROBOT_IP"),
+        opentrons_password=os.environ.get("OPENTRONS_PASSWORD"),
+    )
+
+
+@lru_cache(maxsize=1)
+def get_labware_dir() -> Path:
+    """Resolve the custom labware directory on first use and check the labware files exist."""
+    load_dotenv()
+    labware_dir = os.environ.get("LABWARE_DIR")
+    # find_spec locates the package without importing it (and its prefect dependency)
+    labware_dir = Path(labware_dir) if labware_dir else Path(find_spec("matterlab_opentrons").origin).parent
+    missing = [name for name in LABWARE_FILES if not (labware_dir / name).is_file()]
+    if missing:
+        raise FileNotFoundError(f"Labware definitions missing from {labware_dir}: {', '.join(missing)}")
+    return labware_dir
@@ -1,17 +1,26 @@
-from typing import NamedTuple, List
+from typing import NamedTuple, List, Callable
 import os
 import csv
 import sys
-from dotenv import load_dotenv
+import logging
 
-sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+# Only needed when run as a script; `python -m workflow.<module>` from the repo root already resolves
+_REPO_ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), '..'))
+if _REPO_ROOT not in sys.path:
+    sys.path.append(_REPO_ROOT)
 from matterlab_opentrons import OpenTrons
-from pH_measure.pizerocam.src.image_req_client.ph_analyzer import pHAnalyzer
+from workflow.config import get_config, get_labware_dir
 import time
-import json
 from pathlib import Path
 
-load_dotenv()
+try:
+    import orjson
+    _loads = orjson.loads
+except ImportError:  # fall back to the stdlib parser
+    import json
+    _loads = json.loads
+
+logger = logging.getLogger(__name__)
 
 # Define the experiment type
 class PhExperiment(NamedTuple):
@@ -26,22 +35,25 @@ class PhProtocol:
         self.load_labware_and_instruments()
 
     def otflex_setup(self, simulation: bool = True):
-        otflex_password = os.environ.get("OPENTRONS_PASSWORD")
+        otflex_password = get_config().opentrons_password
         if not otflex_password:
             raise ValueError("OPENTRONS_PASSWORD is not set in the environment. Please add it to your .env file without quotes or spaces.")
         self.ot = OpenTrons(host_alias="otflex", password=otflex_password, simulation=simulation)
-        print(self.ot.invoke("print([slot for slot in protocol.deck])"))
-        print("SSH connected.")
-        print(self.ot.invoke("from opentrons import execute"))
-        print(self.ot.invoke("protocol = execute.get_protocol_api('2.21')"))
+        logger.info("%s", self.ot.invoke([
+            "print([slot for slot in protocol.deck])",
+            "from opentrons import execute",
+            "protocol = execute.get_protocol_api('2.21')",
+        ]))
+        logger.info("SSH connected.")
         self.ot.home()    
 
 
     def load_labware_and_instruments(self):
         # Load custom labware
-        vial_config_6 = json.load(open(Path(r"C:\Users\xmguo\project\solid_dosing\matterlab_opentrons\20mlvial_6_wellplate.json")))
-        ph_config = json.load(open(Path(r"C:\Users\xmguo\project\solid_dosing\matterlab_opentrons\phunit.json")))
-        vial_config_24 = json.load(open(Path(r"C:\Users\xmguo\project\solid_dosing\matterlab_opentrons\al24wellplate_24_wellplate_15000ul.json")))
+        labware_dir = get_labware_dir()
+        vial_config_6 = _loads((labware_dir / "20mlvial_6_wellplate.json").read_bytes())
+        ph_config = _loads((labware_dir / "phunit.json").read_bytes())
+        vial_config_24 = _loads((labware_dir / "al24wellplate_24_wellplate_15000ul.json").read_bytes())
 
         plates = [
             {"nickname": "plate_96_1", "loadname": "corning_96_wellplate_360ul_flat", "location": "C2", "ot_default": True, "config": {}},
@@ -55,37 +67,53 @@ class PhProtocol:
             {"nickname": "tip_50_96_1", "loadname": "opentrons_flex_96_filtertiprack_50ul", "location": "B2", "ot_default": True, "config": {}}
         ]
 
-        for plate in plates:
-            self.ot.load_labware(plate)
-        for tip in tips:
-            self.ot.load_labware(tip)
+        # All labware loads go to the robot in one round-trip
+        with self.ot.batch():
+            for labware in (*plates, *tips):
+                self.ot.load_labware(labware)
 
         self.ot.load_trash_bin()
         self.ot.load_instrument({"nickname": "p1000", "instrument_name": "flex_1channel_1000", "mount": "left", "tip_racks": ["tip_1000_96_1"], "ot_default": True})
 
 
+    # Pack wells into tip trips of at most `capacity` uL: one aspirate of the trip total, then a dispense per well
+    def dispense_reagent(self, batch: List[PhExperiment], source_labware: str, source_pos: str,
+                         volume_fn: Callable[[PhExperiment], float], pip_name: str = "p1000", capacity: float = 1000):
+        trips, trip, trip_volume = [], [], 0
+        for exp in batch:
+            volume = volume_fn(exp)
+            if trip and trip_volume + volume > capacity:
+                trips.append(trip)
+                trip, trip_volume = [], 0
+            trip.append((exp.well, volume))
+            trip_volume += volume
+        if trip:
+            trips.append(trip)
+
+        ot = self.ot
+        for trip in trips:
+            if logger.isEnabledFor(logging.DEBUG):
+                logger.debug("%s %s uL from %s -> %s", pip_name, sum(v for _, v in trip), source_pos,
+                             ", ".join(f"{well}:{volume}" for well, volume in trip))
+            # One SSH round-trip per tip trip
+            with ot.batch():
+                ot.get_location_from_labware(source_labware, position=source_pos, top=-40)
+                ot.move_to_pip(pip_name=pip_name)
+                ot.aspirate(pip_name=pip_name, volume=sum(v for _, v in trip))
+                for well, volume in trip:
+                    ot.get_location_from_labware("plate_96_1", position=well)
+                    ot.move_to_pip(pip_name=pip_name)
+                    ot.dispense(pip_name=pip_name, volume=volume)
+
     # Run a batch
     def run_batch(self, batch: List[PhExperiment]):
         ot = self.ot
 
-        wells = [exp.well for exp in batch]
-
         # -------------------------
         # Acid with ONE tip
         # -------------------------
         ot.pick_up_tip(pip_name="p1000")
-
-        for exp in batch:
-            # Aspirate acid
-            ot.get_location_from_labware("vial_plate_6", position="A1", top=-40)
-            ot.move_to_pip(pip_name="p1000")
-            ot.aspirate(pip_name="p1000", volume=exp.acid_volume)
-
-            # Dispense into target well
-            ot.get_location_from_labware("plate_96_1", position=exp.well, top=0)
-            ot.move_to_pip(pip_name="p1000")
-            ot.dispense(pip_name="p1000", volume=exp.acid_volume)
-
+        self.dispense_reagent(batch, "vial_plate_6", "A1", lambda e: e.acid_volume)
         ot.drop_tip(pip_name="p1000")
 
 
@@ -93,18 +121,7 @@ class PhProtocol:
         # Base with ONE tip
         # -------------------------
         ot.pick_up_tip(pip_name="p1000")
-
-        for exp in batch:
-            # Aspirate base
-            ot.get_location_from_labware("vial_plate_6", position="B1", top=-40)
-            ot.move_to_pip(pip_name="p1000")
-            ot.aspirate(pip_name="p1000", volume=exp.base_volume)
-
-            # Dispense into target well
-            ot.get_location_from_labware("plate_96_1", position=exp.well, top=0)
-            ot.move_to_pip(pip_name="p1000")
-            ot.dispense(pip_name="p1000", volume=exp.base_volume)
-
+        self.dispense_reagent(batch, "vial_plate_6", "B1", lambda e: e.base_volume)
         ot.drop_tip(pip_name="p1000")
 
 
@@ -114,7 +131,7 @@ class PhProtocol:
         results = {}
 
         # for exp in batch:
-        #     print(f"--- Mixing and measuring pH for {exp.well} ---")
+        #     logger.debug("--- Mixing and measuring pH for %s ---", exp.well)
 
         #     ot.pick_up_tip(pip_name="p1000")
 
@@ -135,6 +152,7 @@ class PhProtocol:
         #     ot.move_to_pip(pip_name="p1000")
 
         #     # Prepare strip
+        #     from pH_measure.pizerocam.src.image_req_client.ph_analyzer import pHAnalyzer  # only when measuring
         #     analyzer = pHAnalyzer()
         #     analyzer.dispense_strip()
 
@@ -157,6 +175,8 @@ class PhProtocol:
 
 # Example usage
 if __name__ == "__main__":
+    logging.basicConfig(level=logging.INFO, format='%(asctime)s %(name)s %(message)s')
+
     # Example experiments
     batch = [
         PhExperiment(well="A1", acid_volume=150, base_volume=150)
@@ -166,4 +186,4 @@ if __name__ == "__main__":
 
     protocol = PhProtocol(simulation=True)
     results = protocol.run_batch(batch)
-    print("Batch results:", results)
+    logger.info("Batch results: %s", results)
@@ -2,15 +2,21 @@ from typing import NamedTuple, List
 import os
 import csv
 import sys
-sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+# Only needed when run as a script; `python -m workflow.<module>` from the repo root already resolves
+_REPO_ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), '..'))
+if _REPO_ROOT not in sys.path:
+    sys.path.append(_REPO_ROOT)
 from matterlab_opentrons import OpenTrons
-from pH_measure.pizerocam.src.image_req_client.ph_analyzer import pHAnalyzer
+from workflow.config import get_config, get_labware_dir
 import time
-import json
 from pathlib import Path
-from dotenv import load_dotenv
 
-load_dotenv()
+try:
+    import orjson
+    _loads = orjson.loads
+except ImportError:  # fall back to the stdlib parser
+    import json
+    _loads = json.loads
 
 # Define the experiment type
 class PhExperiment(NamedTuple):
@@ -25,22 +31,25 @@ class PhProtocol:
         self.load_labware_and_instruments()
 
     def otflex_setup(self, simulation: bool = True):
-        otflex_password = os.environ.get("OPENTRONS_PASSWORD")
+        otflex_password = get_config().opentrons_password
         if not otflex_password:
             raise ValueError("OPENTRONS_PASSWORD is not set in the environment. Please add it to your .env file without quotes or spaces.")
         self.ot = OpenTrons(host_alias="otflex", password=otflex_password, simulation=simulation)
-        print(self.ot.invoke("print([slot for slot in protocol.deck])"))
+        print(self.ot.invoke([
+            "print([slot for slot in protocol.deck])",
+            "from opentrons import execute",
+            "protocol = execute.get_protocol_api('2.21')",
+        ]))
         print("SSH connected.")
-        print(self.ot.invoke("from opentrons import execute"))
-        print(self.ot.invoke("protocol = execute.get_protocol_api('2.21')"))
         self.ot.home()    
 
 
     def load_labware_and_instruments(self):
         # Load custom labware
-        vial_config_6 = json.load(open(Path(r"C:\Users\xmguo\project\solid_dosing\matterlab_opentrons\20mlvial_6_wellplate.json")))
-        ph_config = json.load(open(Path(r"C:\Users\xmguo\project\solid_dosing\matterlab_opentrons\phunit.json")))
-        vial_config_24 = json.load(open(Path(r"C:\Users\xmguo\project\solid_dosing\matterlab_opentrons\al24wellplate_24_wellplate_15000ul.json")))
+        labware_dir = get_labware_dir()
+        vial_config_6 = _loads((labware_dir / "20mlvial_6_wellplate.json").read_bytes())
+        ph_config = _loads((labware_dir / "phunit.json").read_bytes())
+        vial_config_24 = _loads((labware_dir / "al24wellplate_24_wellplate_15000ul.json").read_bytes())
 
         plates = [
             {"nickname": "plate_96_1", "loadname": "corning_96_wellplate_360ul_flat", "location": "C2", "ot_default": True, "config": {}},
@@ -54,10 +63,10 @@ class PhProtocol:
             {"nickname": "tip_50_96_1", "loadname": "opentrons_flex_96_filtertiprack_50ul", "location": "B2", "ot_default": True, "config": {}}
         ]
 
-        for plate in plates:
-            self.ot.load_labware(plate)
-        for tip in tips:
-            self.ot.load_labware(tip)
+        # All labware loads go to the robot in one round-trip
+        with self.ot.batch():
+            for labware in (*plates, *tips):
+                self.ot.load_labware(labware)
 
         self.ot.load_trash_bin()
         self.ot.load_instrument({"nickname": "p1000", "instrument_name": "flex_1channel_1000", "mount": "left", "tip_racks": ["tip_1000_96_1"], "ot_default": True})
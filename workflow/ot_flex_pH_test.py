@@ -1,35 +1,98 @@
 import sys
 import os
 sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
-from matterlab_opentrons import OpenTrons
-from prefect import flow
+from matterlab_opentrons import OpenTrons, get_shared_client
+from workflow.config import get_config, get_labware_dir
+from prefect import flow, task, get_run_logger
 from pathlib import Path
+from functools import lru_cache
 import time
-import json
-from pH_measure.pizerocam.src.image_req_client.ph_analyzer import pHAnalyzer
-from dotenv import load_dotenv
 
-load_dotenv()
+try:
+    import orjson
+    _loads = orjson.loads
+except ImportError:  # fall back to the stdlib parser
+    import json
+    _loads = json.loads
+
+
+# Configuration (.env, labware paths) is read and validated once, at import
+CONFIG = get_config()
+LABWARE_DIR = get_labware_dir()
+VIAL_6_PATH, PH_UNIT_PATH, VIAL_24_PATH = (
+    LABWARE_DIR / "20mlvial_6_wellplate.json",
+    LABWARE_DIR / "phunit.json",
+    LABWARE_DIR / "al24wellplate_24_wellplate_15000ul.json",
+)
+
+
+@lru_cache(maxsize=None)
+def _load_labware(path: str, mtime_ns: int) -> dict:
+    """Parse a labware definition once per (path, modification time)."""
+    return _loads(Path(path).read_bytes())
+
+
+def load_labware_config(path: Path) -> dict:
+    """Return the parsed labware definition, re-reading it only if the file changed."""
+    return _load_labware(str(path), path.stat().st_mtime_ns)
+
+
+@task(log_prints=False)
+def dispense_wells(ot: OpenTrons, well_list, volume: float, capacity: float = 1000):
+    """
+    Transfer `volume` from vial_plate_6 A1 into each vial_plate_24 well as one Prefect task.
+    Each trip aspirates for as many wells as fit in `capacity` and dispenses them in turn with
+    its own tip, so a tip that has been in a target never goes back into the source.
+    The OpenTrons steps are @flow-wrapped; calling their plain functions (.fn) here avoids a
+    subflow run per pipetting step.
+    """
+    if volume <= 0:
+        raise ValueError(f"volume must be positive, got {volume}")
+    pick_up_tip, move_to_pip, aspirate, dispense, drop_tip = (
+        getattr(OpenTrons, name).fn for name in ("pick_up_tip", "move_to_pip", "aspirate", "dispense", "drop_tip")
+    )
+    # Resolve the source and every target location on the robot once, up front
+    ot.invoke([
+        "source_location = vial_plate_6['A1'].top(-55)",
+        f"target_locations = {{well: vial_plate_24[well].top(-30) for well in {list(well_list)!r}}}",
+    ])
+    wells_per_trip = max(1, int(capacity // volume))
+    # One SSH round-trip per trip instead of one per step
+    for start in range(0, len(well_list), wells_per_trip):
+        trip = well_list[start:start + wells_per_trip]
+        with ot.batch():
+            pick_up_tip(ot, pip_name="p1000")
+            ot.invoke("location = source_location")
+            move_to_pip(ot, pip_name="p1000")
+            aspirate(ot, pip_name="p1000", volume=volume * len(trip))
+            for well in trip:
+                ot.invoke(f"location = target_locations['{well}']")
+                move_to_pip(ot, pip_name="p1000")
+                dispense(ot, pip_name="p1000", volume=volume)
+            drop_tip(ot, pip_name="p1000")
+
 
 @flow(log_prints=True)
 def demo_flex(simulation: bool = True):
-    otflex_password = os.environ.get("OPENTRONS_PASSWORD")
+    otflex_password = CONFIG.opentrons_password
     if not otflex_password:
         raise ValueError("OPENTRONS_PASSWORD is not set in the environment. Please add it to your .env file without quotes or spaces.")
-    ot = OpenTrons(host_alias="otflex", password=otflex_password, simulation=simulation)
-    print(ot.invoke("print([slot for slot in protocol.deck])"))
+    # Reuse the SSH session across flow runs in the same process
+    client = get_shared_client(host_alias="otflex", password=otflex_password)
+    ot = OpenTrons(host_alias="otflex", password=otflex_password, simulation=simulation, client=client)
+    # Remote output is buffered on ot and logged once at the end of the flow
+    ot.invoke([
+        "print([slot for slot in protocol.deck])",
+        "from opentrons import execute",
+        "protocol = execute.get_protocol_api('2.21')",
+    ])
     print("SSH connected.")
-    print(ot.invoke("from opentrons import execute"))
-    print(ot.invoke("protocol = execute.get_protocol_api('2.21')"))
     ot.home()
 
     # Load labware
-    with open(Path(r"C:\Users\xmguo\project\solid_dosing\matterlab_opentrons\20mlvial_6_wellplate.json"), "r") as f:
-        vial_config_6 = json.load(f)
-    with open(Path(r"C:\Users\xmguo\project\solid_dosing\matterlab_opentrons\phunit.json"), "r") as f:
-        ph_config = json.load(f)
-    with open(Path(r"C:\Users\xmguo\project\solid_dosing\matterlab_opentrons\al24wellplate_24_wellplate_15000ul.json"), "r") as f:
-        vial_config_24 = json.load(f)
+    vial_config_6 = load_labware_config(VIAL_6_PATH)
+    ph_config = load_labware_config(PH_UNIT_PATH)
+    vial_config_24 = load_labware_config(VIAL_24_PATH)
 
     plates = [
         {"nickname": "plate_96_1", "loadname": "corning_96_wellplate_360ul_flat", "location": "C2", "ot_default": True, "config": {}},
@@ -43,13 +106,16 @@ def demo_flex(simulation: bool = True):
         {"nickname": "tip_50_96_1", "loadname": "opentrons_flex_96_filtertiprack_50ul", "location": "B2", "ot_default": True, "config": {}}
     ]
 
-    for plate in plates:
-        ot.load_labware(plate)
-    for tip in tips:
-        ot.load_labware(tip)
+    well_list = ["A6","B6"]
+
+    # Deck setup and every pipetting step are compiled into one script, uploaded and run once
+    with ot.plan():
+        for labware in (*plates, *tips):
+            ot.load_labware(labware)
 
-    ot.load_trash_bin()
-    ot.load_instrument({"nickname": "p1000", "instrument_name": "flex_1channel_1000", "mount" : "left", "tip_racks": ["tip_1000_96_1"],"ot_default": True})
+        ot.load_trash_bin()
+        ot.load_instrument({"nickname": "p1000", "instrument_name": "flex_1channel_1000", "mount" : "left", "tip_racks": ["tip_1000_96_1"],"ot_default": True})
+        dispense_wells(ot, well_list, 200)
 
     # Wells and volume plan
     # well_list = ["A1","A2","A3","A4","A5","A6","A7"]
@@ -83,16 +149,6 @@ def demo_flex(simulation: bool = True):
 
     #tip_location = ot.get_location_from_labware(labware_nickname="tip_1000_96_1", position="A1", top=0)
     
-    well_list = ["A6","B6"]
-    for well in well_list:
-         ot.pick_up_tip(pip_name="p1000")
-         ot.get_location_from_labware("vial_plate_6", position="A1", top=-55)
-         ot.move_to_pip(pip_name="p1000")
-         ot.aspirate(pip_name="p1000", volume=200)
-         ot.get_location_from_labware("vial_plate_24", position=well, top=-30)
-         ot.move_to_pip(pip_name="p1000")
-         ot.dispense(pip_name="p1000", volume=200)
-         ot.drop_tip(pip_name="p1000")
 
 
     # # --------- 2. Dispense all NaHCO3 with second tip ---------
@@ -129,6 +185,7 @@ def demo_flex(simulation: bool = True):
         # Move to pH measurement unit
     #     ph_location = ot.get_location_from_labware(labware_nickname="phunit", position="A1", top=-6)
     #     ot.move_to_pip(pip_name="p1000")
+    #     from pH_measure.pizerocam.src.image_req_client.ph_analyzer import pHAnalyzer  # only when measuring
     #     analyzer = pHAnalyzer()
     #     analyzer.dispense_strip()
     #     # Dispense into pH unit
@@ -146,6 +203,7 @@ def demo_flex(simulation: bool = True):
 
     # ot.home()
     # ot.close_session()
+    ot.flush_log(get_run_logger())
     return results  # Return results for saving outside the flow
 
 if __name__ == "__main__":
@@ -154,12 +212,11 @@ if __name__ == "__main__":
     import csv
     output_path = os.path.join(os.path.dirname(__file__), "ph_results.csv")
     if results:
-        with open(output_path, "w", newline="") as csvfile:
+        with open(output_path, "w", newline="", buffering=1 << 16) as csvfile:
             fieldnames = ["well", "v_acid", "v_base", "pH"]
             writer = csv.DictWriter(csvfile, fieldnames=fieldnames)
             writer.writeheader()
-            for row in results:
-                writer.writerow(row)
+            writer.writerows(results)
         print(f"\nResults saved to {output_path}\n")
     else:
         print("No results to save.")
@@ -4,20 +4,16 @@ import sys
 import os
 from pathlib import Path
 sys.path.append(str(Path(__file__).parent.parent))
-from matterlab_balances import MTXPRBalance, MTXPRBalanceDoors
-# from robot.robot_control import URController
-from robot.robot_control_URArm import URController
+from matterlab_balances import MTXPRBalanceDoors
 from matterlab_balances.mt_balance import MTXPRBalanceDosingError
+from workflow._clients import get_balance, get_robot
 import time
 
-BALANCE_IP = os.environ.get("BALANCE_IP")
-BALANCE_PASSWORD = os.environ.get("BALANCE_PASSWORD")
-
 substance_name = "NaCl"
 target_weight_mg = 0.2
 
-balance = MTXPRBalance (host = BALANCE_IP, password = BALANCE_PASSWORD)
-rob = URController()
+balance = get_balance()
+rob = get_robot()
 
 
 # rob.gripper_pos(rob.gripper_dist["open"]["dose"])
@@ -3,25 +3,59 @@ import time
 import sys
 import os
 from pathlib import Path
+from concurrent.futures import ThreadPoolExecutor
 sys.path.append(str(Path(__file__).parent.parent))
-from matterlab_balances import MTXPRBalance, MTXPRBalanceDoors
-from robot.robot_control_URArm import URController
+from matterlab_balances import MTXPRBalanceDoors
 from matterlab_balances.mt_balance import MTXPRBalanceDosingError
+from workflow._clients import get_balance, get_robot
 import time
 
-BALANCE_IP = os.environ.get("BALANCE_IP")
-BALANCE_PASSWORD = os.environ.get("BALANCE_PASSWORD")
-
 substance_name = "NaCl"
 target_weight_mg = 1
 
-balance = MTXPRBalance (host = BALANCE_IP, password = BALANCE_PASSWORD)
-rob = URController()
-balance.open_door(MTXPRBalanceDoors.RIGHT_OUTER)
-balance.close_door(MTXPRBalanceDoors.RIGHT_OUTER)
- 
+# Balance and robot handshakes are independent network I/O; connect both at once
+with ThreadPoolExecutor(max_workers=2) as ex:
+    balance_future = ex.submit(get_balance)
+    rob_future = ex.submit(get_robot)
+    try:
+        balance = balance_future.result(timeout=30)
+    except Exception as e:
+        raise RuntimeError(f"Balance initialization failed: {e}") from e
+    try:
+        rob = rob_future.result(timeout=30)
+    except Exception as e:
+        raise RuntimeError(f"Robot initialization failed: {e}") from e
+
+# Last commanded state per door; repeated open/close requests for the same state are skipped
+door_state = {}
+
+def ensure_door(door, state):
+    """Open or close a balance door unless it is already in that state. Returns True if the door moved."""
+    if door_state.get(door) == state:
+        return False
+    try:
+        if state == "open":
+            balance.open_door(door)
+        else:
+            balance.close_door(door)
+    except Exception:
+        door_state.pop(door, None)  # Position unknown after a failed command
+        raise
+    door_state[door] = state
+    return True
+
+# Balance door commands run on their own thread so they overlap with robot motion
+door_pool = ThreadPoolExecutor(max_workers=1)
+
+def cycle_door(door):
+    """Open then close the door so its state is known."""
+    ensure_door(door, "open")
+    ensure_door(door, "closed")
+
+door_future = door_pool.submit(cycle_door, MTXPRBalanceDoors.RIGHT_OUTER)
 rob.home()
 rob.activate_gripper()
+door_future.result(timeout=30)
 
 # Define well locations from A1 to D2
 rows = ['A']
@@ -36,19 +70,24 @@ current_weight_mg = target_weight_mg
 rob.dose_2_balance('A1')
 for well in well_locations:
     print(f"\n--- Processing {well} --- (target_weight_mg={current_weight_mg})")
-    balance.open_door(MTXPRBalanceDoors.RIGHT_OUTER)
+    ensure_door(MTXPRBalanceDoors.RIGHT_OUTER, "open")
     rob.vial_2_balance(well)
-    balance.close_door(MTXPRBalanceDoors.RIGHT_OUTER)
+    ensure_door(MTXPRBalanceDoors.RIGHT_OUTER, "closed")
     try:
         balance.auto_dose(substance_name=substance_name, target_weight_mg=current_weight_mg)
     except MTXPRBalanceDosingError as e:
         print(f"Dosing failed for {well}: {e}")
         # Optionally log or handle the error further
-    balance.open_door(MTXPRBalanceDoors.RIGHT_OUTER)
-    time.sleep(1)  # Ensure the door is fully open before moving
+    # Open the door while the gripper opens for the pick-up, then confirm it is fully open
+    door_future = door_pool.submit(ensure_door, MTXPRBalanceDoors.RIGHT_OUTER, "open")
+    rob.gripper_pos(rob.gripper_dist["open"]["vial"])
+    if door_future.result(timeout=30) and not balance.wait_for_door(MTXPRBalanceDoors.RIGHT_OUTER, 100, timeout=3.0, interval=0.02):
+        raise RuntimeError(f"Balance door did not open; not moving to pick up {well}")
     rob.vial_2_OT(well)
     current_weight_mg += 0.5  # Increase by 0.5mg for next run
 
+door_pool.shutdown()
+
 
 # rob.balance_2_home(
 
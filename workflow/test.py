@@ -1,11 +1,29 @@
-from typing import NamedTuple
+from dataclasses import dataclass
+
+import numpy as np
 
 ExpResult = float
 
-class Experiment(NamedTuple):
+@dataclass(slots=True, frozen=True)
+class Experiment:
     well: str
     acid_volume: float
     base_volume: float
 
+@dataclass(slots=True, frozen=True)
+class ExperimentBatch:
+    """Column-wise view of a batch: one volume array per reagent, aligned with wells."""
+    wells: list[str]
+    acid: np.ndarray
+    base: np.ndarray
+
+    @classmethod
+    def from_list(cls, batch: list[Experiment]) -> "ExperimentBatch":
+        return cls(
+            wells=[exp.well for exp in batch],
+            acid=np.fromiter((exp.acid_volume for exp in batch), dtype=np.float64, count=len(batch)),
+            base=np.fromiter((exp.base_volume for exp in batch), dtype=np.float64, count=len(batch)),
+        )
+
 def execute_experiment(batch: list[Experiment]) -> list[ExpResult]:
     pass
\ No newline at end of file